@@ -0,0 +1,234 @@
+import itertools
+import os
+
+import lnk
+
+
+UNINSTALL_KEYS = (
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+)
+
+DRIVE_FIXED = 3
+
+
+class PlatformBackend:
+    def folder(self, name):
+        raise NotImplementedError
+
+    def drives(self):
+        raise NotImplementedError
+
+    def enum_subkeys(self, hive, path):
+        raise NotImplementedError
+
+    def query_value(self, hive, path, name):
+        raise NotImplementedError
+
+    def key_info(self, hive, path):
+        raise NotImplementedError
+
+    def read_link_target(self, path):
+        return lnk.read_link_target(path)
+
+    def installed_software(self):
+        installed = set()
+        for hive, path in UNINSTALL_KEYS:
+            installed.update(self.uninstall_names(hive, path))
+        return installed
+
+    def uninstall_names(self, hive, path):
+        names = set()
+        try:
+            subkeys = self.enum_subkeys(hive, path)
+        except OSError:
+            return names
+        for subkey in subkeys:
+            try:
+                display_name = self.query_value(hive, path + "\\" + subkey, "DisplayName")
+            except OSError:
+                continue
+            if display_name:
+                names.add(display_name.lower())
+        return names
+
+
+class WindowsBackend(PlatformBackend):
+    ENVIRONMENT_FOLDERS = {
+        "temp": "TEMP",
+        "tmp": "TMP",
+        "windows": "SYSTEMROOT",
+        "local_appdata": "LOCALAPPDATA",
+        "appdata": "APPDATA",
+        "program_data": "PROGRAMDATA",
+    }
+
+    def __init__(self, environ=None):
+        self.environ = os.environ if environ is None else environ
+
+    def folder(self, name):
+        variable = self.ENVIRONMENT_FOLDERS.get(name)
+        if variable is not None:
+            return self.environ.get(variable, "")
+        if name == "home":
+            return os.path.expanduser("~")
+        if name == "desktop":
+            return os.path.join(os.path.expanduser("~"), "Desktop")
+        if name == "system_drive":
+            return self.environ.get("SYSTEMDRIVE", "C:") + "\\"
+        if name == "program_files":
+            return self.environ.get("PROGRAMW6432") or self.environ.get("PROGRAMFILES") or os.path.join(
+                self.folder("system_drive"), "Program Files"
+            )
+        if name == "program_files_x86":
+            return self.environ.get("PROGRAMFILES(X86)") or os.path.join(
+                self.folder("system_drive"), "Program Files (x86)"
+            )
+        raise KeyError(name)
+
+    def drives(self):
+        try:
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            mask = kernel32.GetLogicalDrives()
+        except (ImportError, AttributeError, OSError):
+            return [drive for drive in ("C:\\", "D:\\", "E:\\", "F:\\") if os.path.exists(drive)]
+
+        drives = []
+        for offset in range(26):
+            if mask & (1 << offset):
+                drive = f"{chr(ord('A') + offset)}:\\"
+                if kernel32.GetDriveTypeW(drive) == DRIVE_FIXED:
+                    drives.append(drive)
+        return drives
+
+    def _winreg(self):
+        try:
+            import winreg
+        except ImportError:
+            raise OSError("注册表仅在 Windows 上可用")
+        return winreg
+
+    def _open_key(self, hive, path):
+        winreg = self._winreg()
+        root_key = {"HKLM": winreg.HKEY_LOCAL_MACHINE, "HKCU": winreg.HKEY_CURRENT_USER}[hive]
+        return winreg.OpenKey(root_key, path)
+
+    def enum_subkeys(self, hive, path):
+        winreg = self._winreg()
+        subkeys = []
+        with self._open_key(hive, path) as key:
+            i = 0
+            while True:
+                try:
+                    subkeys.append(winreg.EnumKey(key, i))
+                except OSError:
+                    break
+                i += 1
+        return subkeys
+
+    def query_value(self, hive, path, name):
+        winreg = self._winreg()
+        with self._open_key(hive, path) as key:
+            return winreg.QueryValueEx(key, name)[0]
+
+    def key_info(self, hive, path):
+        winreg = self._winreg()
+        with self._open_key(hive, path) as key:
+            subkeys, values, last_write = winreg.QueryInfoKey(key)
+        return subkeys, last_write
+
+
+class FixtureBackend(PlatformBackend):
+    def __init__(self, root, installed=(), drives=None, shortcut_targets=None):
+        self.root = root
+        home = os.path.join(root, "Users", "user")
+        local_appdata = os.path.join(home, "AppData", "Local")
+        self.folders = {
+            "temp": os.path.join(local_appdata, "Temp"),
+            "tmp": os.path.join(local_appdata, "Temp"),
+            "windows": os.path.join(root, "Windows"),
+            "local_appdata": local_appdata,
+            "appdata": os.path.join(home, "AppData", "Roaming"),
+            "program_data": os.path.join(root, "ProgramData"),
+            "home": home,
+            "desktop": os.path.join(home, "Desktop"),
+            "program_files": os.path.join(root, "Program Files"),
+            "program_files_x86": os.path.join(root, "Program Files (x86)"),
+            "system_drive": root,
+        }
+        self._drives = [root] if drives is None else list(drives)
+        self.registry = {}
+        self._ticks = itertools.count(1)
+        self.shortcut_targets = dict(shortcut_targets or {})
+        for name in installed:
+            self.add_installed(name)
+
+    def folder(self, name):
+        return self.folders[name]
+
+    def drives(self):
+        return list(self._drives)
+
+    def add_key(self, hive, path, values=None):
+        key = self.registry.get((hive, path.lower()))
+        if key is None:
+            key = self.registry[(hive, path.lower())] = {"name": path, "values": {}, "last_write": next(self._ticks)}
+            self._touch_parent(hive, path)
+        if values:
+            key["values"].update(values)
+            key["last_write"] = next(self._ticks)
+        return key
+
+    def remove_key(self, hive, path):
+        prefix = path.lower() + "\\"
+        for key_hive, key_path in list(self.registry):
+            if key_hive == hive and (key_path == path.lower() or key_path.startswith(prefix)):
+                del self.registry[(key_hive, key_path)]
+        self._touch_parent(hive, path)
+
+    def _touch_parent(self, hive, path):
+        parent = path.rpartition("\\")[0]
+        if parent:
+            self.add_key(hive, parent)["last_write"] = next(self._ticks)
+
+    def add_installed(self, display_name, hive="HKLM", key_name=None):
+        path = UNINSTALL_KEYS[0][1] if hive == "HKLM" else UNINSTALL_KEYS[2][1]
+        key_name = key_name or display_name
+        self.add_key(hive, path + "\\" + key_name, {"DisplayName": display_name})
+
+    def _key(self, hive, path):
+        key = self.registry.get((hive, path.lower()))
+        if key is None:
+            raise FileNotFoundError(f"{hive}\\{path}")
+        return key
+
+    def enum_subkeys(self, hive, path):
+        self._key(hive, path)
+        prefix = path.lower() + "\\"
+        return sorted(
+            key["name"][len(prefix):]
+            for (key_hive, key_path), key in self.registry.items()
+            if key_hive == hive and key_path.startswith(prefix) and "\\" not in key_path[len(prefix):]
+        )
+
+    def key_info(self, hive, path):
+        key = self._key(hive, path)
+        return len(self.enum_subkeys(hive, path)), key["last_write"]
+
+    def query_value(self, hive, path, name):
+        values = self._key(hive, path)["values"]
+        if name not in values:
+            raise FileNotFoundError(name)
+        return values[name]
+
+    def read_link_target(self, path):
+        if path in self.shortcut_targets:
+            return self.shortcut_targets[path]
+        return super().read_link_target(path)
+
+
+def default_backend():
+    return WindowsBackend()
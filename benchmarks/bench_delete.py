@@ -0,0 +1,106 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deleter import DeletionEngine
+
+
+def build_tree(root, loose_dirs, files_per_dir, big_dirs, big_dir_files):
+    items = []
+    for i in range(loose_dirs):
+        dir_path = os.path.join(root, "temp", f"d{i:04d}")
+        os.makedirs(dir_path)
+        for j in range(files_per_dir):
+            path = os.path.join(dir_path, f"f{j:05d}.tmp")
+            with open(path, "wb") as f:
+                f.write(b"x" * ((i + j) % 2048))
+            items.append(path)
+
+    for i in range(big_dirs):
+        dir_path = os.path.join(root, "cache", f"big{i}")
+        for j in range(big_dir_files):
+            sub = os.path.join(dir_path, f"s{j % 32:02d}", f"t{j % 5}")
+            os.makedirs(sub, exist_ok=True)
+            with open(os.path.join(sub, f"f{j:06d}"), "wb") as f:
+                f.write(b"y" * (j % 4096))
+        items.append(dir_path)
+
+    return items
+
+
+def legacy_clean(items):
+    success_count = 0
+    total_size = 0
+
+    for item_path in items:
+        try:
+            if os.path.isfile(item_path):
+                size = os.path.getsize(item_path)
+                os.remove(item_path)
+                success_count += 1
+                total_size += size
+            elif os.path.isdir(item_path):
+                size = 0
+                for dirpath, dirnames, filenames in os.walk(item_path):
+                    for filename in filenames:
+                        size += os.path.getsize(os.path.join(dirpath, filename))
+                shutil.rmtree(item_path)
+                success_count += 1
+                total_size += size
+        except Exception:
+            continue
+
+    return success_count, total_size
+
+
+def engine_clean(items, workers):
+    results = DeletionEngine(max_workers=workers).delete(items)
+    return sum(1 for r in results if r.ok), sum(r.freed for r in results)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="serial clean_items loop vs DeletionEngine")
+    parser.add_argument("--loose-dirs", type=int, default=100)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--big-dirs", type=int, default=4)
+    parser.add_argument("--big-dir-files", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="delete_bench_")
+    try:
+        runs = [("serial loop", legacy_clean, ())]
+        runs += [(f"engine x{w}", engine_clean, (w,)) for w in args.workers]
+
+        rows = []
+        for name, func, extra in runs:
+            root = os.path.join(base, name.replace(" ", "_"))
+            items = build_tree(root, args.loose_dirs, args.files, args.big_dirs, args.big_dir_files)
+            (count, freed), elapsed = timed(func, items, *extra)
+            rows.append((name, count, freed, elapsed))
+            shutil.rmtree(root, ignore_errors=True)
+
+        print(f"{len(items)} items ({args.loose_dirs * args.files} loose files, "
+              f"{args.big_dirs} directories of {args.big_dir_files} files)")
+        baseline = rows[0][3]
+        for name, count, freed, elapsed in rows:
+            print(f"{name:<14} {elapsed:7.3f}s  ok={count:<7} freed={freed:<12} {baseline / elapsed:5.2f}x")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lnk
+
+
+MY_COMPUTER_CLSID = bytes.fromhex("e04fd020ea3a6910a2d808002b30309d")
+
+
+def _item(payload):
+    return struct.pack("<H", len(payload) + 2) + payload
+
+
+def _file_entry(name, is_dir):
+    short_name = name.encode("ascii", errors="replace") + b"\x00"
+    if len(short_name) % 2:
+        short_name += b"\x00"
+    head = bytes([0x31 if is_dir else 0x32, 0]) + struct.pack("<IIH", 0, 0, 0x10 if is_dir else 0x20)
+    extension_offset = 2 + len(head) + len(short_name)
+    long_name = name.encode("utf-16-le") + b"\x00\x00"
+    extension = struct.pack("<HHIIIH", 0, 9, lnk.FILE_ENTRY_EXTENSION, 0, 0, 0x2E)
+    extension += b"\x00" * 2 + b"\x00" * 8 + b"\x00" * 8 + struct.pack("<H", 0) + b"\x00" * 8
+    extension += long_name + struct.pack("<H", extension_offset)
+    extension = struct.pack("<H", len(extension)) + extension[2:]
+    return _item(head + short_name + extension)
+
+
+def build_id_list(windows_path):
+    drive, rest = windows_path[:3], windows_path[3:]
+    items = _item(bytes([0x1F, 0x50]) + MY_COMPUTER_CLSID)
+    items += _item(bytes([0x2F]) + drive.encode("ascii") + b"\x00" * 19)
+    parts = [part for part in rest.split("\\") if part]
+    for index, part in enumerate(parts):
+        items += _file_entry(part, index < len(parts) - 1)
+    items += b"\x00\x00"
+    return struct.pack("<H", len(items)) + items
+
+
+def build_link_info(target):
+    volume_id = struct.pack("<IIII", 0x11, 3, 0, 0x10) + b"\x00"
+    header_size = 0x1C
+    base = target.encode(lnk.ANSI_ENCODING) + b"\x00"
+    volume_offset = header_size
+    base_offset = volume_offset + len(volume_id)
+    suffix_offset = base_offset + len(base)
+    body = volume_id + base + b"\x00"
+    size = header_size + len(body)
+    header = struct.pack(
+        "<IIIIIII", size, header_size, lnk.VOLUME_ID_AND_LOCAL_BASE_PATH,
+        volume_offset, base_offset, 0, suffix_offset,
+    )
+    return header + body
+
+
+def build_link(target=None, id_list_target=None):
+    flags = lnk.IS_UNICODE
+    body = b""
+    if id_list_target is not None:
+        flags |= lnk.HAS_LINK_TARGET_ID_LIST
+        body += build_id_list(id_list_target)
+    if target is not None:
+        flags |= lnk.HAS_LINK_INFO
+        body += build_link_info(target)
+    header = struct.pack("<I", lnk.HEADER_SIZE) + lnk.LINK_CLSID + struct.pack("<I", flags)
+    header += b"\x00" * (lnk.HEADER_SIZE - len(header))
+    return header + body + b"\x00\x00\x00\x00"
+
+
+def com_invalid_shortcuts(paths):
+    import pythoncom
+    from win32com.shell import shell
+
+    invalid = []
+    for path in paths:
+        try:
+            shell_link = pythoncom.CoCreateInstance(
+                shell.CLSID_ShellLink, None, pythoncom.CLSCTX_INPROC_SERVER, shell.IID_IShellLink
+            )
+            shell_link.QueryInterface(pythoncom.IID_IPersistFile).Load(path)
+            target = shell_link.GetPath(shell.SLGP_SHORTPATH)[0]
+            if not target or not os.path.exists(target):
+                invalid.append(path)
+        except Exception:
+            continue
+    return invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="binary .lnk parser vs COM IShellLink")
+    parser.add_argument("--shortcuts", type=int, default=2000)
+    parser.add_argument("--targets", type=int, default=200)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="lnk_bench_")
+    try:
+        targets_dir = os.path.join(root, "targets")
+        links_dir = os.path.join(root, "links")
+        os.makedirs(targets_dir)
+        os.makedirs(links_dir)
+
+        expected_invalid = set()
+        for i in range(args.shortcuts):
+            target = os.path.join(targets_dir, f"app{i % args.targets}.exe")
+            if i % args.targets % 3 == 0:
+                open(target, "ab").close()
+            link_path = os.path.join(links_dir, f"link{i}.lnk")
+            with open(link_path, "wb") as f:
+                f.write(build_link(target))
+            if i % args.targets % 3 != 0:
+                expected_invalid.add(link_path)
+        paths = sorted(os.path.join(links_dir, name) for name in os.listdir(links_dir))
+
+        id_list_path = "C:\\Program Files\\Example App\\example.exe"
+        parsed = lnk.parse_link(build_link(id_list_target=id_list_path))
+        if parsed.target != id_list_path:
+            print(f"IDList fixture parsed as {parsed.target!r}, expected {id_list_path!r}")
+            return 1
+
+        start = time.perf_counter()
+        invalid = lnk.find_invalid_shortcuts(paths)
+        parser_seconds = time.perf_counter() - start
+        if set(invalid) != expected_invalid:
+            print(f"parser found {len(invalid)} invalid shortcuts, expected {len(expected_invalid)}")
+            return 1
+
+        print(f"{len(paths)} shortcuts, {args.targets} distinct targets, {len(invalid)} invalid")
+        print(f"binary parser  {parser_seconds:8.4f}s")
+
+        try:
+            import pythoncom
+        except ImportError:
+            print("COM path skipped (pywin32 is not available)")
+            return 0
+
+        start = time.perf_counter()
+        com_invalid = com_invalid_shortcuts(paths)
+        com_seconds = time.perf_counter() - start
+        print(f"COM IShellLink {com_seconds:8.4f}s ({len(com_invalid)} invalid)")
+        print(f"speedup        {com_seconds / parser_seconds:8.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matcher import NameMatcher
+
+
+WORDS = [
+    "microsoft", "visual", "studio", "code", "adobe", "reader", "google", "chrome",
+    "mozilla", "firefox", "python", "java", "runtime", "nvidia", "driver", "intel",
+    "graphics", "office", "teams", "zoom", "steam", "epic", "games", "launcher",
+    "7-zip", "win rar", "vlc", "media", "player", "git", "node_js", "docker",
+    "desktop", "anydesk", "team viewer", "capcut", "wechat", "qq", "tencent", "update",
+]
+
+FOLDERS = ["packages", "crashdumps", "fontcache", "thumbcache", "connecteddevices", "peernet", "symbols"]
+
+
+def random_name(rng, max_words):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(1, max_words))]
+    if rng.random() < 0.3:
+        words.append(f"{rng.randint(1, 30)}.{rng.randint(0, 9)}")
+    separator = rng.choice([" ", "-", "_", ""])
+    return separator.join(words)
+
+
+def legacy_is_name_match(dir_name, installed_name):
+    dir_name_clean = dir_name.replace(" ", "").replace("-", "").replace("_", "")
+    installed_clean = installed_name.replace(" ", "").replace("-", "").replace("_", "")
+    return dir_name_clean in installed_clean or installed_clean in dir_name_clean
+
+
+def legacy_matches(dir_name, installed_software):
+    for installed in installed_software:
+        if legacy_is_name_match(dir_name, installed):
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="installed-software name matching")
+    parser.add_argument("--installed", type=int, default=500)
+    parser.add_argument("--dirs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    installed = {random_name(rng, 4).lower() for _ in range(args.installed)}
+    dirs = [
+        random_name(rng, 3).lower() if i % 2 else f"{rng.choice(FOLDERS)}{rng.randint(0, 999)}"
+        for i in range(args.dirs)
+    ]
+    dirs += ["", "-", "x", "zz unrelated folder", "microsoftvisualstudiocode2022extra"]
+
+    start = time.perf_counter()
+    expected = [legacy_matches(name, installed) for name in dirs]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = NameMatcher(installed)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [matcher.matches(name) for name in dirs]
+    match_seconds = time.perf_counter() - start
+
+    mismatches = [name for name, a, b in zip(dirs, expected, actual) if a != b]
+    if mismatches:
+        print(f"{len(mismatches)} mismatches, e.g. {mismatches[:5]}")
+        return 1
+
+    print(f"{len(installed)} installed names, {len(dirs)} directory names, "
+          f"{sum(expected)} matches, results identical")
+    print(f"legacy loops   {legacy_seconds:8.4f}s")
+    print(f"NameMatcher    {match_seconds:8.4f}s (+ {build_seconds:.4f}s build)")
+    print(f"speedup        {legacy_seconds / (match_seconds + build_seconds):8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
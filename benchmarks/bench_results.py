@@ -0,0 +1,76 @@
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results import ScanResultSet, TopResultSet
+
+
+CATEGORIES = ["临时文件", "Chrome缓存", "Edge浏览器缓存", "系统日志", "回收站"]
+
+
+def synthetic_records(count, files_per_dir):
+    base = os.path.join("C:\\", "Users", "user", "AppData", "Local")
+    for i in range(count):
+        category = CATEGORIES[(i // 10000) % len(CATEGORIES)]
+        parent = os.path.join(base, category, f"dir_{i // files_per_dir:06d}")
+        yield category, os.path.join(parent, f"f_{i:08x}.tmp"), (i * 37) % 65536
+
+
+def build_dict(records):
+    results = {}
+    for category, path, size in records:
+        file_id = f"temp_{len(results)}"
+        results[file_id] = {
+            "category": category,
+            "path": path,
+            "size": size
+        }
+    return results
+
+
+def build_result_set(records):
+    return ScanResultSet(records)
+
+
+def build_top_set(records, top_n=100):
+    results = TopResultSet(top_n)
+    results.offer_all(records)
+    return results.finish()
+
+
+def measure(builder, count, files_per_dir):
+    gc.collect()
+    tracemalloc.start()
+    container = builder(synthetic_records(count, files_per_dir))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dict-of-dicts vs ScanResultSet vs TopResultSet memory")
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--files-per-dir", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.count} records, {args.files_per_dir} files per directory")
+    rows = []
+    builders = (("dict-of-dicts", build_dict), ("ScanResultSet", build_result_set), ("TopResultSet", build_top_set))
+    for name, builder in builders:
+        container, current, peak = measure(builder, args.count, args.files_per_dir)
+        rows.append((name, current, peak))
+        del container
+
+    for name, current, peak in rows:
+        print(f"{name:<15} retained={current / 1048576:8.1f} MB  peak={peak / 1048576:8.1f} MB  "
+              f"per entry={current / args.count:6.1f} B")
+    print(f"reduction: {rows[0][1] / rows[1][1]:.2f}x, top-N: {rows[0][1] / rows[2][1]:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
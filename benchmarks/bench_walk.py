@@ -0,0 +1,136 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from walker import walk
+
+
+class SyscallCounter:
+    def __init__(self, names=("stat", "lstat", "scandir")):
+        self.names = names
+        self.counts = {}
+        self._originals = {}
+
+    def _wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            self.counts[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        for name in self.names:
+            self.counts[name] = 0
+            self._originals[name] = getattr(os, name)
+            setattr(os, name, self._wrap(name, self._originals[name]))
+        return self
+
+    def __exit__(self, *exc):
+        for name, func in self._originals.items():
+            setattr(os, name, func)
+        return False
+
+
+def build_tree(root, dir_count, files_per_dir, depth):
+    file_count = 0
+    for i in range(dir_count):
+        parts = [f"d{i % 7}_{level}" for level in range(i % depth)]
+        dir_path = os.path.join(root, *parts, f"cache_{i}")
+        os.makedirs(dir_path, exist_ok=True)
+        for j in range(files_per_dir):
+            with open(os.path.join(dir_path, f"f_{j:05d}"), "wb") as f:
+                f.write(b"x" * ((i * 31 + j * 17) % 4096))
+            file_count += 1
+    return file_count
+
+
+def legacy_scan(root):
+    count = 0
+    total_size = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            try:
+                total_size += os.path.getsize(os.path.join(dirpath, filename))
+                count += 1
+            except Exception:
+                continue
+    return count, total_size
+
+
+def walker_scan(root):
+    count = 0
+    total_size = 0
+    for entry in walk(root):
+        if not entry.is_dir:
+            total_size += entry.size
+            count += 1
+    return count, total_size
+
+
+def count_entries(root):
+    return sum(1 for _ in walk(root))
+
+
+def run(name, func, root, repeat):
+    with SyscallCounter() as counter:
+        count, total_size = func(root)
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(root)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        "name": name,
+        "files": count,
+        "bytes": total_size,
+        "seconds": best,
+        "calls": dict(counter.counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="os.walk + getsize vs scandir walker")
+    parser.add_argument("--dirs", type=int, default=500)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--root", default=None)
+    args = parser.parse_args()
+
+    root = args.root or tempfile.mkdtemp(prefix="walk_bench_")
+    try:
+        file_count = build_tree(root, args.dirs, args.files, args.depth)
+        print(f"synthetic tree: {root} ({file_count} files)")
+
+        baseline = run("os.walk + getsize", legacy_scan, root, args.repeat)
+        scandir = run("scandir walker", walker_scan, root, args.repeat)
+
+        if (baseline["files"], baseline["bytes"]) != (scandir["files"], scandir["bytes"]):
+            print("mismatch between walkers:", baseline, scandir)
+            return 1
+
+        for result in (baseline, scandir):
+            calls = result["calls"]
+            print(
+                f"{result['name']:<20} {result['seconds']:.3f}s  "
+                f"os.stat={calls['stat']} os.lstat={calls['lstat']} os.scandir={calls['scandir']}"
+            )
+        print(f"DirEntry.stat calls by walker: {count_entries(root)} "
+              f"(served from the directory listing on Windows, one lstat each on POSIX)")
+        print(f"speedup: {baseline['seconds'] / scandir['seconds']:.2f}x")
+    finally:
+        if args.root is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
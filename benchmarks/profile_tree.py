@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import FixtureBackend
+from bench_lnk import build_link
+
+
+MANIFEST_NAME = "profile_manifest.json"
+
+INSTALLED_APPS = [f"Example App {i}" for i in range(60)]
+RESIDUAL_APPS = ["TeamViewer", "AnyDesk", "Splashtop Streamer", "RealVNC", "Microsoft Office Tools"]
+KEPT_RESIDUAL_APP = "Radmin Viewer"
+
+
+class ProfileWriter:
+    def __init__(self, root, seed):
+        self.root = root
+        self.random = random.Random(seed)
+        self.files = 0
+        self.bytes = 0
+        self.areas = {}
+
+    def write_files(self, area, directory, count, max_size=4096, prefix="f", suffix=""):
+        os.makedirs(directory, exist_ok=True)
+        area_files, area_bytes = self.areas.get(area, (0, 0))
+        for i in range(count):
+            size = self.random.randint(0, max_size)
+            with open(os.path.join(directory, f"{prefix}{i:06d}{suffix}"), "wb") as f:
+                f.write(b"\0" * size)
+            area_files += 1
+            area_bytes += size
+        self.areas[area] = (area_files, area_bytes)
+        self.files += count
+
+    def write_tree(self, area, directory, count, depth, fanout=4, max_size=4096):
+        per_leaf = max(1, count // (fanout ** min(depth, 3)))
+        written = 0
+        stack = [(directory, 0)]
+        while stack and written < count:
+            current, level = stack.pop()
+            if level >= depth:
+                batch = min(per_leaf, count - written)
+                self.write_files(area, current, batch, max_size)
+                written += batch
+                continue
+            for i in range(fanout if level < 3 else 1):
+                stack.append((os.path.join(current, f"n{level}_{i}"), level + 1))
+        if written < count:
+            self.write_files(area, directory, count - written, max_size)
+
+
+def scaled(value, scale):
+    return max(1, int(value * scale))
+
+
+def generate_profile(root, scale=1.0, seed=0):
+    backend = FixtureBackend(root)
+    folder = backend.folder
+    writer = ProfileWriter(root, seed)
+
+    writer.write_files("temp", folder("temp"), scaled(20000, scale), max_size=16384, suffix=".tmp")
+    writer.write_files("temp", os.path.join(folder("windows"), "Temp"), scaled(2000, scale), suffix=".log")
+
+    chrome = os.path.join(folder("local_appdata"), "Google", "Chrome", "User Data", "Default")
+    writer.write_files("browser", os.path.join(chrome, "Cache"), scaled(20000, scale), prefix="data_")
+    writer.write_files("browser", os.path.join(chrome, "Code Cache"), scaled(5000, scale), prefix="js_")
+    firefox = os.path.join(folder("local_appdata"), "Mozilla", "Firefox", "Profiles")
+    for profile in ("abcd.default", "efgh.default-release"):
+        writer.write_tree("browser", os.path.join(firefox, profile, "cache2"), scaled(3000, scale), depth=2)
+
+    edge = os.path.join(folder("local_appdata"), "Microsoft", "Edge", "User Data")
+    for profile in ("Default", "Profile 1", "Profile 2"):
+        for cache in ("Cache", "Code Cache", "GPUCache"):
+            writer.write_files("edge", os.path.join(edge, profile, cache), scaled(2000, scale))
+    for version in ("WebView_1", "WebView_2"):
+        writer.write_tree("edge", os.path.join(folder("program_data"), "Microsoft", "EdgeUpdate", version),
+                          scaled(1000, scale), depth=3)
+
+    capcut = os.path.join(folder("local_appdata"), "CapCut")
+    for cache in ("MaterialCache", "EffectCache", "PreviewCache", "Temp"):
+        writer.write_tree("jianying", os.path.join(capcut, cache), scaled(5000, scale), depth=8, fanout=3)
+
+    logs = os.path.join(folder("local_appdata"), "Microsoft", "Windows")
+    for name in ("INetCache", "History"):
+        writer.write_tree("log", os.path.join(logs, name), scaled(2000, scale), depth=3)
+    writer.write_files("log", os.path.join(folder("appdata"), "Microsoft", "Windows", "Recent"),
+                       scaled(500, scale), suffix=".lnk")
+    writer.write_files("prefetch", os.path.join(folder("windows"), "Prefetch"), scaled(500, scale), suffix=".pf")
+
+    writer.write_files("recycle", os.path.join(root, "$Recycle.Bin", "S-1-5-21"), scaled(1000, scale),
+                       max_size=65536)
+
+    for app in INSTALLED_APPS:
+        writer.write_tree("program_files", os.path.join(folder("program_files"), app), scaled(200, scale), depth=2)
+    for app in RESIDUAL_APPS:
+        writer.write_tree("program_residual", os.path.join(folder("program_files_x86"), app),
+                          scaled(1000, scale), depth=3)
+        writer.write_files("appdata_residual", os.path.join(folder("appdata"), app), scaled(200, scale))
+    kept = os.path.join(folder("program_files"), KEPT_RESIDUAL_APP)
+    writer.write_tree("program_files", kept, scaled(500, scale), depth=2)
+    writer.write_files("program_files", kept, 1, prefix="uninst", suffix=".exe")
+
+    shortcut_count = scaled(500, scale)
+    targets = [os.path.join(folder("program_files"), app, "app.exe") for app in INSTALLED_APPS]
+    for target in targets[::2]:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        open(target, "ab").close()
+    shortcut_dirs = [
+        folder("desktop"),
+        os.path.join(folder("appdata"), "Microsoft", "Windows", "Start Menu", "Programs"),
+        os.path.join(folder("program_data"), "Microsoft", "Windows", "Start Menu", "Programs"),
+    ]
+    for directory in shortcut_dirs:
+        os.makedirs(directory, exist_ok=True)
+    for i in range(shortcut_count):
+        path = os.path.join(shortcut_dirs[i % len(shortcut_dirs)], f"shortcut_{i:05d}.lnk")
+        with open(path, "wb") as f:
+            f.write(build_link(targets[i % len(targets)]))
+    writer.areas["invalid_shortcut"] = (shortcut_count, 0)
+
+    manifest = {
+        "scale": scale,
+        "seed": seed,
+        "files": writer.files,
+        "installed": INSTALLED_APPS + [KEPT_RESIDUAL_APP],
+        "areas": {area: {"files": files, "bytes": size} for area, (files, size) in writer.areas.items()},
+    }
+    with open(os.path.join(root, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(root):
+    with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_backend(root, manifest=None):
+    manifest = manifest or load_manifest(root)
+    return FixtureBackend(root, installed=manifest["installed"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate a synthetic Windows user-profile tree")
+    parser.add_argument("root")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_profile(args.root, args.scale, args.seed)
+    print(f"{manifest['files']} files written to {args.root}")
+    for area, counts in sorted(manifest["areas"].items()):
+        print(f"  {area:18s} {counts['files']:>9d} files {counts['bytes']:>14d} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
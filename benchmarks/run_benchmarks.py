@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_walk import SyscallCounter
+from profile_tree import fixture_backend, generate_profile, load_manifest, MANIFEST_NAME
+
+
+SCAN_METHODS = [
+    "_scan_temp_files",
+    "_scan_browser_cache",
+    "_scan_edge_dirs",
+    "_scan_jianying_dirs",
+    "_scan_system_logs",
+    "_scan_recycle_bin",
+    "_scan_program_files_residuals",
+    "_scan_appdata_residuals",
+    "_scan_invalid_shortcuts",
+    "scan_c_drive",
+]
+BENCHMARKS = SCAN_METHODS + ["_get_dir_size", "clean_items"]
+SYSCALLS = ("stat", "lstat", "scandir", "remove", "unlink", "rmdir")
+
+
+class CountingEntry:
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+        self._stated = set()
+        self.name = entry.name
+        self.path = entry.path
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks not in self._stated:
+            self._stated.add(follow_symlinks)
+            self._counter.counts["DirEntry.stat"] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def is_dir(self, follow_symlinks=True):
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        return self._entry.is_symlink()
+
+    def inode(self):
+        return self._entry.inode()
+
+    def __fspath__(self):
+        return self.path
+
+
+class EntryCounter(SyscallCounter):
+    def __init__(self):
+        super().__init__(SYSCALLS)
+        self.files = 0
+
+    def __enter__(self):
+        super().__enter__()
+        self.counts["DirEntry.stat"] = 0
+        return self
+
+    def _wrap(self, name, func):
+        wrapper = super()._wrap(name, func)
+        if name != "scandir":
+            return wrapper
+
+        counter = self
+
+        class CountingScandir:
+            def __init__(self, it):
+                self._it = it
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._it.close()
+                return False
+
+            def __iter__(self):
+                for entry in self._it:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            counter.files += 1
+                    except OSError:
+                        pass
+                    yield CountingEntry(entry, counter)
+
+            def close(self):
+                self._it.close()
+
+        def scandir(*args, **kwargs):
+            return CountingScandir(wrapper(*args, **kwargs))
+        return scandir
+
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss)
+
+
+def run_once(name, tree, scratch):
+    from cleaner import DiskCleaner
+    from results import ScanResultSet
+    from walker import iter_files
+
+    cleaner = DiskCleaner(backend=fixture_backend(tree))
+
+    if name == "clean_items":
+        source = cleaner.backend.folder("temp")
+        target = os.path.join(scratch, "Temp")
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(source, target)
+        items = ScanResultSet(("临时文件", entry.path, entry.size) for entry in iter_files(target))
+        call = lambda: cleaner.clean_items(list(items))
+        summarize = lambda result: (len(items), result[1])
+    elif name == "_get_dir_size":
+        call = lambda: cleaner._get_dir_size(tree)
+        summarize = lambda result: (None, result)
+    else:
+        call = getattr(cleaner, name)
+        summarize = lambda result: (len(result), result.total_size())
+
+    with EntryCounter() as counter:
+        start = time.perf_counter()
+        result = call()
+        seconds = time.perf_counter() - start
+
+    items, size = summarize(result)
+    return {
+        "seconds": seconds,
+        "items": items,
+        "bytes": size,
+        "files": items if name == "clean_items" else counter.files,
+        "syscalls": dict(counter.counts),
+    }
+
+
+def run_worker(name, tree, repeat):
+    scratch = tempfile.mkdtemp(prefix="bench_scratch_")
+    try:
+        runs = [run_once(name, tree, scratch) for i in range(repeat)]
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    best = min(runs, key=lambda run: run["seconds"])
+    seconds = best["seconds"]
+    return dict(
+        best,
+        name=name,
+        runs=[run["seconds"] for run in runs],
+        files_per_second=best["files"] / seconds if seconds else None,
+        bytes_per_second=best["bytes"] / seconds if seconds else None,
+        peak_rss=peak_rss(),
+    )
+
+
+def run_isolated(name, tree, repeat):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", name, "--tree", tree, "--repeat", str(repeat)]
+    output = subprocess.run(
+        command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    return json.loads(output)
+
+
+def format_rate(value, unit):
+    if value is None:
+        return "-"
+    for prefix in ("", "K", "M", "G"):
+        if value < 1000:
+            return f"{value:7.1f} {prefix}{unit}"
+        value /= 1000
+    return f"{value:7.1f} T{unit}"
+
+
+def print_report(results, baseline=None):
+    baseline = {result["name"]: result for result in (baseline or {}).get("results", [])}
+    print(f"{'benchmark':32s} {'seconds':>9s} {'files/s':>12s} {'bytes/s':>12s} {'peak RSS':>10s} {'syscalls':>9s}"
+          + ("  vs baseline" if baseline else ""))
+    for result in results:
+        line = (
+            f"{result['name']:32s} {result['seconds']:9.4f} "
+            f"{format_rate(result['files_per_second'], '/s'):>12s} "
+            f"{format_rate(result['bytes_per_second'], 'B/s'):>12s} "
+            f"{(result['peak_rss'] or 0) / 1048576:8.1f}MB "
+            f"{sum(result['syscalls'].values()):9d}"
+        )
+        previous = baseline.get(result["name"])
+        if previous and result["seconds"]:
+            line += f"  {previous['seconds'] / result['seconds']:6.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time every scanner, _get_dir_size and clean_items")
+    parser.add_argument("--tree", help="reuse a tree made by profile_tree.py instead of generating one")
+    parser.add_argument("--scale", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", choices=BENCHMARKS)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--worker", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.worker, args.tree, args.repeat), sys.stdout)
+        return 0
+
+    tree = args.tree
+    generated = None
+    if tree is None:
+        generated = tree = tempfile.mkdtemp(prefix="bench_profile_")
+    try:
+        if not os.path.exists(os.path.join(tree, MANIFEST_NAME)):
+            generate_profile(tree, args.scale, args.seed)
+        manifest = load_manifest(tree)
+        print(f"profile tree: {tree} ({manifest['files']} files, scale {manifest['scale']})")
+
+        results = [run_isolated(name, tree, args.repeat) for name in (args.only or BENCHMARKS)]
+    finally:
+        if generated is not None:
+            shutil.rmtree(generated, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.output:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "manifest": manifest,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
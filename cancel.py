@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+class CancelToken:
+    def __init__(self, timeout=None, parent=None, lazy=False, clock=time.monotonic):
+        self.parent = parent
+        self.timeout = timeout
+        self.reason = None
+        self.incomplete = parent.incomplete if parent is not None else set()
+        self._clock = clock
+        self._event = threading.Event()
+        self.deadline = None
+        if timeout is not None and not lazy:
+            self.deadline = clock() + timeout
+
+    def cancel(self, reason="cancelled"):
+        if self.reason is None:
+            self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        if self._event.is_set():
+            return True
+        if self.parent is not None and self.parent.cancelled:
+            self.cancel(self.parent.reason)
+            return True
+        if self.timeout is not None:
+            now = self._clock()
+            if self.deadline is None:
+                self.deadline = now + self.timeout
+            elif now >= self.deadline:
+                self.cancel("deadline")
+                return True
+        return False
+
+    @property
+    def partial(self):
+        return bool(self.incomplete)
+
+    def child(self, timeout=None, lazy=False):
+        return CancelToken(timeout, parent=self, lazy=lazy, clock=self._clock)
@@ -1,36 +1,72 @@
 import os
-import shutil
-import glob
-import winreg
-from pathlib import Path
-import ctypes
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+from backend import default_backend
+from cancel import CancelToken
+from deleter import DeletionEngine
+from lnk import find_invalid_shortcuts
+from matcher import NameMatcher
+from planner import RootPlanner
+from progress import ProgressObserver
+from results import ScanResultSet, TopResultSet
+from rules import NameFilter, load_rules
+from software_cache import build_index
+from walker import iter_files, list_dir, list_dir_observed, dir_size, size_tree
+
+
+DEFAULT_SCAN_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+SCAN_BATCH_SIZE = 256
+UNINSTALLER_PROBE_DEPTH = 2
+
+SCAN_CATEGORIES = (
+    "temp", "browser", "edge", "jianying", "log", "prefetch", "recycle",
+    "program_residual", "appdata_residual", "invalid_shortcut", "teams", "vscode",
+)
+GROUPED_RULE_CATEGORIES = ("browser", "edge", "jianying")
+RESIDUAL_CATEGORIES = ("program_residual", "appdata_residual")
+
+ScanJob = namedtuple("ScanJob", ["prefix", "func", "args", "root"])
+
+
+@contextmanager
+def _no_phase():
+    yield
 
 
 class DiskCleaner:
-    def __init__(self):
+    def __init__(self, max_workers=None, backend=None, rules=None, software_cache=None):
+        self.backend = backend if backend is not None else default_backend()
+        self._rules = rules
         self.results = {}
+        self.max_workers = max_workers
+        self.software_cache = software_cache
+        self._uninstaller_cache = {}
+        self._shortcut_target_cache = {}
+        self._scan_local = threading.local()
+        self._discovery_lock = threading.Lock()
+        self._rule_roots = {}
+        self._installed_future = None
+        self._name_matcher = None
         self.temp_dirs = [
-            os.environ.get("TEMP", ""),
-            os.environ.get("TMP", ""),
-            os.path.join(os.environ.get("SYSTEMROOT", ""), "Temp"),
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Temp"),
+            self.backend.folder("temp"),
+            self.backend.folder("tmp"),
+            os.path.join(self.backend.folder("windows"), "Temp"),
+            os.path.join(self.backend.folder("local_appdata"), "Temp"),
         ]
 
-        self.browser_cache_dirs = self._get_browser_cache_dirs()
-
-        self.edge_dirs = self._get_edge_dirs()
-
-        self.jianying_dirs = self._get_jianying_dirs()
-
         self.log_dirs = [
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "INetCache"),
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "INetCookies"),
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "History"),
-            os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Recent"),
+            os.path.join(self.backend.folder("local_appdata"), "Microsoft", "Windows", "INetCache"),
+            os.path.join(self.backend.folder("local_appdata"), "Microsoft", "Windows", "INetCookies"),
+            os.path.join(self.backend.folder("local_appdata"), "Microsoft", "Windows", "History"),
+            os.path.join(self.backend.folder("appdata"), "Microsoft", "Windows", "Recent"),
         ]
 
-        self.installed_software = self._get_installed_software()
-
         self.common_residual_patterns = [
             'anyviewer', 'teamviewer', 'anydesk', 'remotedesktop',
             'splashtop', 'logmein', 'supremo',
@@ -38,519 +74,662 @@ class DiskCleaner:
             'microsoft office', 'office'
         ]
 
-    def _get_installed_software(self):
-        installed = set()
+    @property
+    def rules(self):
+        if self._rules is None:
+            self._rules = load_rules()
+        return self._rules
+
+    @property
+    def installed_software(self):
+        return self.prefetch_installed_software().result().names
+
+    @property
+    def name_matcher(self):
+        if self._name_matcher is None:
+            index = self.prefetch_installed_software().result()
+            self._name_matcher = NameMatcher(index.names, index.normalized)
+        return self._name_matcher
+
+    @property
+    def rule_roots(self):
+        return self._roots_for(self.rules.prefixes())
+
+    @property
+    def browser_cache_dirs(self):
+        return self._rule_dirs("browser")
+
+    @property
+    def edge_dirs(self):
+        return self._rule_dirs("edge")
+
+    @property
+    def jianying_dirs(self):
+        return self._rule_dirs("jianying")
+
+    def prefetch_installed_software(self):
+        with self._discovery_lock:
+            if self._installed_future is None:
+                self._installed_future = Future()
+                thread = threading.Thread(
+                    target=self._load_installed_software, args=(self._installed_future,), daemon=True
+                )
+                thread.start()
+            return self._installed_future
+
+    def _load_installed_software(self, future):
+        future.set_result(self._get_installed_software())
 
+    def _get_installed_software(self):
         try:
-            registry_paths = [
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-            ]
-
-            for root_key, sub_key in registry_paths:
-                try:
-                    with winreg.OpenKey(root_key, sub_key) as key:
-                        i = 0
-                        while True:
-                            try:
-                                software_key = winreg.EnumKey(key, i)
-                                with winreg.OpenKey(key, software_key) as subkey:
-                                    try:
-                                        display_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                                        if display_name:
-                                            installed.add(display_name.lower())
-                                    except WindowsError:
-                                        pass
-                                i += 1
-                            except WindowsError:
-                                break
-                except WindowsError:
-                    pass
+            if self.software_cache is not None:
+                return self.software_cache.load(self.backend)
+            return build_index(self.backend.installed_software())
         except Exception:
-            pass
-
-        return installed
-
-    def _get_browser_cache_dirs(self):
-        cache_dirs = []
+            return build_index(())
+
+    def _roots_for(self, prefixes):
+        with self._discovery_lock:
+            roots = {prefix: self._rule_roots[prefix] for prefix in prefixes if prefix in self._rule_roots}
+            missing = [prefix for prefix in prefixes if prefix not in roots]
+            if missing:
+                for prefix in missing:
+                    roots[prefix] = []
+                resolved, complete = self._resolve_rules(self.rules.filter(*missing))
+                for root in resolved:
+                    roots[root.rule.prefix].append(root)
+                if complete:
+                    self._rule_roots.update((prefix, roots[prefix]) for prefix in missing)
+            return [root for prefix in prefixes for root in roots[prefix]]
+
+    def _resolve_rules(self, rules):
+        errors = []
+
+        def lister(path):
+            return list_dir(path, lambda failed_path, e: errors.append(e))
 
         try:
-            chrome_path = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "User Data", "Default", "Cache")
-            if os.path.exists(chrome_path):
-                cache_dirs.append(("Chrome缓存", chrome_path))
-
-            chrome_code_cache = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "User Data", "Default", "Code Cache")
-            if os.path.exists(chrome_code_cache):
-                cache_dirs.append(("Chrome代码缓存", chrome_code_cache))
-
-            edge_path = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Edge", "User Data", "Default", "Cache")
-            if os.path.exists(edge_path):
-                cache_dirs.append(("Edge缓存", edge_path))
-
-            firefox_path = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Mozilla", "Firefox", "Profiles")
-            if os.path.exists(firefox_path):
-                for profile in os.listdir(firefox_path):
-                    cache_path = os.path.join(firefox_path, profile, "cache2")
-                    if os.path.exists(cache_path):
-                        cache_dirs.append(("Firefox缓存", cache_path))
+            resolved = rules.resolve(self.backend.folder, lister)
         except Exception:
-            pass
-
-        return cache_dirs
-
-    def _get_edge_dirs(self):
-        edge_dirs = []
-
+            return [], False
+        return resolved, all(isinstance(e, FileNotFoundError) for e in errors)
+
+    def _rule_dirs(self, prefix):
+        return [(root.rule.label, root.path) for root in self._roots_for((prefix,))]
+
+    def _other_rule_jobs(self, categories=None):
+        return self._rule_jobs([
+            prefix for prefix in self.rules.prefixes()
+            if prefix not in GROUPED_RULE_CATEGORIES and (categories is None or prefix in categories)
+        ])
+
+    def _rule_jobs(self, prefixes):
+        jobs = []
+
+        for root in self._roots_for(prefixes):
+            rule = root.rule
+            func = self._scan_files if rule.mode == "files" else self._scan_dir_total
+            args = (rule.label, root.path)
+            if rule.include or rule.exclude:
+                args += (NameFilter(rule.include, rule.exclude),)
+            jobs.append(ScanJob(rule.prefix, func, args, root.path))
+
+        return jobs
+
+    def scan_c_drive(self, max_workers=None, progress=None, categories=None, stats=None,
+                     cancel=None, budgets=None, top_n=None, min_size=None, depth=None):
+        if cancel is None and budgets:
+            cancel = CancelToken()
+        with self._phase(stats, "plan"):
+            groups = self._scan_groups(categories, depth)
+
+        batches = self._iter_job_batches(
+            groups, SCAN_BATCH_SIZE, max_workers, progress, stats, cancel, budgets
+        )
+        if top_n is not None or min_size is not None:
+            results = TopResultSet(top_n, min_size)
+            for (group_index, job_index, prefix), records in batches:
+                results.offer_all(records, self._job_root(groups[group_index][job_index]))
+            return self._mark_partial(results.finish(), cancel)
+
+        outputs = [[[] for job in jobs] for jobs in groups]
+        for (group_index, job_index, prefix), records in batches:
+            outputs[group_index][job_index].extend(records)
+
+        results = ScanResultSet()
+        for job_outputs in outputs:
+            for records in job_outputs:
+                results.extend(records)
+
+        return self._mark_partial(results, cancel)
+
+    def iter_scan(self, batch_size=SCAN_BATCH_SIZE, max_workers=None, progress=None,
+                  categories=None, stats=None, cancel=None, budgets=None, depth=None):
+        if cancel is None and budgets:
+            cancel = CancelToken()
+        with self._phase(stats, "plan"):
+            groups = self._scan_groups(categories, depth)
+
+        batches = self._iter_job_batches(
+            groups, batch_size, max_workers, progress, stats, cancel, budgets
+        )
+        for key, records in batches:
+            yield records
+
+    def _iter_job_batches(self, groups, batch_size, max_workers=None, progress=None,
+                          stats=None, cancel=None, budgets=None):
+        stream_cancel = cancel.child() if cancel is not None else CancelToken()
+        tokens = self._category_tokens(stream_cancel, budgets)
+        keyed_jobs = [
+            ((group_index, job_index, prefix), self._iter_job,
+             (prefix, func, args, root, stats, tokens.get(prefix, stream_cancel), progress))
+            for group_index, jobs in enumerate(groups)
+            for job_index, (prefix, func, args, root) in enumerate(jobs)
+        ]
+        workers = self._scan_workers(max_workers)
+        self._uninstaller_cache = {}
+        self._shortcut_target_cache = {}
+
+        if progress is not None:
+            progress.start("scan", len(keyed_jobs))
+
+        with self._phase(stats, "scan", jobs=len(keyed_jobs), workers=workers):
+            batches = self._run_keyed_jobs(keyed_jobs, batch_size, workers, progress, stream_cancel)
+            for key, batch in batches:
+                if progress is not None:
+                    progress.advance(category=batch[-1][0])
+                yield key, batch
+
+    def _run_keyed_jobs(self, keyed_jobs, batch_size, workers, progress=None, cancel=None):
+        if workers <= 1:
+            for key, func, args in keyed_jobs:
+                batch = []
+                for record in func(*args):
+                    batch.append(record)
+                    if len(batch) >= batch_size:
+                        yield key, batch
+                        batch = []
+                if batch:
+                    yield key, batch
+                if progress is not None:
+                    progress.advance(done=1)
+            return
+
+        out = queue.Queue(maxsize=workers * 4)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = []
+        pending = len(keyed_jobs)
         try:
-            localappdata = os.environ.get("LOCALAPPDATA", "")
-            programdata = os.environ.get("PROGRAMDATA", "")
-
-            edge_webview = os.path.join(programdata, "Microsoft", "EdgeUpdate")
-            if os.path.exists(edge_webview):
-                for item in os.listdir(edge_webview):
-                    item_path = os.path.join(edge_webview, item)
-                    if os.path.isdir(item_path) and "WebView" in item:
-                        edge_dirs.append(("Edge WebView旧版本", item_path))
-
-            edge_core = os.path.join(programdata, "Microsoft", "EdgeCore")
-            if os.path.exists(edge_core):
-                for item in os.listdir(edge_core):
-                    item_path = os.path.join(edge_core, item)
-                    if os.path.isdir(item_path):
-                        edge_dirs.append(("Edge Core旧版本", item_path))
-
-            edge_cache = os.path.join(localappdata, "Microsoft", "Edge", "User Data")
-            if os.path.exists(edge_cache):
-                for profile in os.listdir(edge_cache):
-                    profile_path = os.path.join(edge_cache, profile)
-                    if os.path.isdir(profile_path):
-                        cache_path = os.path.join(profile_path, "Cache")
-                        if os.path.exists(cache_path):
-                            edge_dirs.append(("Edge浏览器缓存", cache_path))
-
-                        code_cache = os.path.join(profile_path, "Code Cache")
-                        if os.path.exists(code_cache):
-                            edge_dirs.append(("Edge代码缓存", code_cache))
-
-                        gpucache = os.path.join(profile_path, "GPUCache")
-                        if os.path.exists(gpucache):
-                            edge_dirs.append(("Edge GPU缓存", gpucache))
-        except Exception:
-            pass
-
-        return edge_dirs
-
-    def _get_jianying_dirs(self):
-        jianying_dirs = []
+            for key, func, args in keyed_jobs:
+                futures.append(executor.submit(self._stream_job, out, stop, key, func, args, batch_size))
+
+            while pending:
+                key, batch = out.get()
+                if batch is None:
+                    pending -= 1
+                    if progress is not None:
+                        progress.advance(done=1)
+                    continue
+                yield key, batch
+        finally:
+            stop.set()
+            if pending and cancel is not None:
+                cancel.cancel("closed")
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _phase(self, stats, name, category="phase", **args):
+        if stats is None:
+            return _no_phase()
+        return stats.phase(name, category, **args)
+
+    def _category_tokens(self, cancel, budgets):
+        if cancel is None or not budgets:
+            return {}
+        return {prefix: cancel.child(budget, lazy=True) for prefix, budget in budgets.items()}
+
+    def _mark_partial(self, results, cancel):
+        if cancel is not None and cancel.partial:
+            results.partial = True
+            results.incomplete = sorted(cancel.incomplete)
+        return results
 
+    def _iter_job(self, prefix, func, args, root, stats=None, cancel=None, progress=None):
+        if stats is None and cancel is None and progress is None:
+            yield from func(*args)
+            return
+
+        recorder = None
+        label = args[0] if root is not None else None
+        if stats is not None:
+            recorder = stats.root(prefix, root if root is not None else args[0], label)
+        observer = self._job_observer(recorder, progress)
+
+        records = func(*args)
+        with self._phase(stats, label or prefix, "job", root=root if root is not None else args[0]):
+            while True:
+                if cancel is not None and cancel.cancelled:
+                    records.close()
+                    cancel.incomplete.add(prefix)
+                    break
+                previous = (self._observer(), self._cancel_token())
+                self._scan_local.observer = observer
+                self._scan_local.cancel = cancel
+                start = time.perf_counter()
+                try:
+                    record = next(records)
+                except StopIteration:
+                    break
+                finally:
+                    if recorder is not None:
+                        recorder.seconds += time.perf_counter() - start
+                    self._scan_local.observer, self._scan_local.cancel = previous
+                if recorder is not None:
+                    recorder.items += 1
+                yield record
+
+        if cancel is not None and cancel.cancelled:
+            cancel.incomplete.add(prefix)
+
+    def _job_observer(self, recorder, progress):
+        if progress is None:
+            return recorder
+        return ProgressObserver(progress, recorder)
+
+    def _observer(self):
+        return getattr(self._scan_local, "observer", None)
+
+    def _cancel_token(self):
+        return getattr(self._scan_local, "cancel", None)
+
+    def _is_cancelled(self):
+        cancel = self._cancel_token()
+        return cancel is not None and cancel.cancelled
+
+    def _record_error(self, path, exc):
+        observer = self._observer()
+        if observer is not None:
+            observer.error(path, exc)
+
+    def _list_dir(self, path):
+        observer = self._observer()
+        if observer is None:
+            return list_dir(path)
+        return list_dir_observed(path, observer)
+
+    def _stream_job(self, out, stop, key, func, args, batch_size):
         try:
-            localappdata = os.environ.get("LOCALAPPDATA", "")
-
-            capcut_base = os.path.join(localappdata, "CapCut")
-            if os.path.exists(capcut_base):
-                material_cache = os.path.join(capcut_base, "MaterialCache")
-                if os.path.exists(material_cache):
-                    jianying_dirs.append(("剪映如下缓存内容", material_cache))
-
-                audio_cache = os.path.join(capcut_base, "AudioCache")
-                if os.path.exists(audio_cache):
-                    jianying_dirs.append(("剪映音频缓存", audio_cache))
-
-                workspace_cache = os.path.join(capcut_base, "WorkspaceCache")
-                if os.path.exists(workspace_cache):
-                    jianying_dirs.append(("剪映工作平台缓存", workspace_cache))
-
-                effect_cache = os.path.join(capcut_base, "EffectCache")
-                if os.path.exists(effect_cache):
-                    jianying_dirs.append(("剪映艺术特效缓存", effect_cache))
-
-                temp_cache = os.path.join(capcut_base, "Temp")
-                if os.path.exists(temp_cache):
-                    jianying_dirs.append(("剪映临时文件", temp_cache))
-
-                preview_cache = os.path.join(capcut_base, "PreviewCache")
-                if os.path.exists(preview_cache):
-                    jianying_dirs.append(("剪映预览缓存", preview_cache))
+            if stop.is_set():
+                return
+            batch = []
+            for record in func(*args):
+                if stop.is_set():
+                    return
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    self._put_batch(out, stop, (key, batch))
+                    batch = []
+            if batch:
+                self._put_batch(out, stop, (key, batch))
+        finally:
+            self._put_batch(out, stop, (key, None))
+
+    def _put_batch(self, out, stop, item):
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
 
-                export_cache = os.path.join(capcut_base, "ExportCache")
-                if os.path.exists(export_cache):
-                    jianying_dirs.append(("剪映导出缓存", export_cache))
-        except Exception:
-            pass
+    def _scan_groups(self, categories=None, depth=None):
+        if categories is not None:
+            categories = set(categories)
+        if categories is None or categories & set(RESIDUAL_CATEGORIES):
+            self.prefetch_installed_software()
+
+        builders = [
+            (("temp",), self._temp_file_jobs),
+            (("browser",), self._browser_cache_jobs),
+            (("edge",), self._edge_dir_jobs),
+            (("jianying",), self._jianying_dir_jobs),
+            (("log", "prefetch"), self._system_log_jobs),
+            (("recycle",), self._recycle_bin_jobs),
+            (("program_residual",), self._program_files_residual_jobs),
+            (("appdata_residual",), self._appdata_residual_jobs),
+            (("invalid_shortcut",), self._invalid_shortcut_jobs),
+        ]
+        groups = [
+            builder() if categories is None or categories.intersection(prefixes) else []
+            for prefixes, builder in builders
+        ]
+        groups.append(self._other_rule_jobs(categories))
+        if categories is not None:
+            groups = [[job for job in jobs if job.prefix in categories] for jobs in groups]
+        if depth is not None:
+            groups = [[self._rollup_job(job, depth) for job in jobs] for jobs in groups]
+        return self._plan_jobs(groups)
+
+    def _rollup_job(self, job, depth):
+        if job.func != self._scan_files and job.func != self._scan_dir_total or len(job.args) > 2:
+            return job
+        return job._replace(func=partial(self._scan_rollup, depth))
+
+    def _scan_workers(self, max_workers=None):
+        if max_workers is None:
+            max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = DEFAULT_SCAN_WORKERS
+        return max(1, max_workers)
+
+    def _run_jobs(self, jobs, cancel=None, top_n=None, min_size=None):
+        if top_n is None and min_size is None:
+            results = ScanResultSet()
+            for job in self._plan_jobs([jobs])[0]:
+                results.extend(self._iter_job(job.prefix, job.func, job.args, job.root, cancel=cancel))
+            return self._mark_partial(results, cancel)
+
+        results = TopResultSet(top_n, min_size)
+        for job in self._plan_jobs([jobs])[0]:
+            records = self._iter_job(job.prefix, job.func, job.args, job.root, cancel=cancel)
+            results.offer_all(records, self._job_root(job))
+        return self._mark_partial(results.finish(), cancel)
+
+    def _job_root(self, job):
+        return job.root if job.root is not None else job.args[0]
+
+    def _plan_jobs(self, groups):
+        planner = RootPlanner()
+        for group_index, jobs in enumerate(groups):
+            for job_index, job in enumerate(jobs):
+                if job.root is not None:
+                    planner.add((group_index, job_index), job.root, self._deletes_whole_root(job))
+        plan = planner.plan()
+
+        planned_groups = []
+        for group_index, jobs in enumerate(groups):
+            planned_jobs = []
+            for job_index, job in enumerate(jobs):
+                if job.root is None:
+                    planned_jobs.append(job)
+                    continue
+                planned = plan.get((group_index, job_index))
+                if planned is not None:
+                    category = job.args[0]
+                    planned_jobs.append(job._replace(
+                        args=(category, planned.path, planned.excludes) + job.args[2:],
+                        root=planned.path
+                    ))
+            planned_groups.append(planned_jobs)
+
+        return planned_groups
+
+    def _deletes_whole_root(self, job):
+        if job.func == self._scan_dir_total:
+            return True
+        return isinstance(job.func, partial) and job.func.func == self._scan_rollup
 
-        return jianying_dirs
+    def _scan_program_files_residuals(self, cancel=None):
+        return self._run_jobs(self._program_files_residual_jobs(), cancel)
 
-    def scan_c_drive(self):
-        results = {}
+    def _program_files_residual_jobs(self):
+        jobs = []
 
-        results.update(self._scan_temp_files())
-        results.update(self._scan_browser_cache())
-        results.update(self._scan_edge_dirs())
-        results.update(self._scan_jianying_dirs())
-        results.update(self._scan_system_logs())
-        results.update(self._scan_recycle_bin())
-        results.update(self._scan_program_files_residuals())
-        results.update(self._scan_appdata_residuals())
-        results.update(self._scan_invalid_shortcuts())
+        program_files = self.backend.folder("program_files")
+        program_files_x86 = self.backend.folder("program_files_x86")
 
-        return results
+        for program_dir in [program_files, program_files_x86]:
+            if os.path.exists(program_dir):
+                jobs.append(ScanJob("program_residual", self._scan_program_dir, (program_dir,), None))
 
-    def _scan_program_files_residuals(self):
-        results = {}
-        program_dirs = []
+        return jobs
 
-        program_files = os.path.join("C:\\", "Program Files")
-        program_files_x86 = os.path.join("C:\\", "Program Files (x86)")
+    def _scan_program_dir(self, program_dir):
+        try:
+            for entry in self._list_dir(program_dir):
+                if self._is_cancelled():
+                    return
+                if entry.is_dir:
+                    item_path = entry.path
+                    residual_info = self._is_residual_directory(os.path.basename(item_path), item_path)
+                    if residual_info:
+                        size = self._get_dir_size(item_path)
+                        if self._is_cancelled():
+                            return
+                        if size > 0:
+                            yield f"软件残留 ({residual_info})", item_path, size
+        except Exception as e:
+            self._record_error(program_dir, e)
+            return
 
-        if os.path.exists(program_files):
-            program_dirs.append(program_files)
-        if os.path.exists(program_files_x86):
-            program_dirs.append(program_files_x86)
+    def _is_residual_directory(self, dir_name, dir_path):
+        return self._classify_residual(dir_name, dir_path, (self._has_uninstall_exe,))
 
-        for program_dir in program_dirs:
-            try:
-                for item in os.listdir(program_dir):
-                    item_path = os.path.join(program_dir, item)
-                    if os.path.isdir(item_path):
-                        residual_info = self._is_residual_directory(item, item_path)
-                        if residual_info:
-                            size = self._get_dir_size(item_path)
-                            if size > 0:
-                                file_id = f"program_residual_{len(results)}"
-                                results[file_id] = {
-                                    "category": f"软件残留 ({residual_info})",
-                                    "path": item_path,
-                                    "size": size
-                                }
-            except Exception:
-                continue
+    def _classify_residual(self, dir_name, dir_path, keep_checks):
+        dir_name_lower = dir_name.lower()
 
-        return results
+        pattern = self._match_residual_pattern(dir_name_lower)
+        if pattern is None:
+            return None
 
-    def _is_residual_directory(self, dir_name, dir_path):
-        dir_name_lower = dir_name.lower()
+        if self._is_name_match_any(dir_name_lower):
+            return None
 
-        for installed in self.installed_software:
-            if self._is_name_match(dir_name_lower, installed):
+        for check in keep_checks:
+            if check(dir_path):
                 return None
 
-        if self._has_uninstall_exe(dir_path):
-            return None
+        return f"常见残留 ({pattern})"
 
+    def _match_residual_pattern(self, dir_name_lower):
         for pattern in self.common_residual_patterns:
             if pattern in dir_name_lower:
-                if not self._is_name_match_any(dir_name_lower):
-                    return f"常见残留 ({pattern})"
-
+                return pattern
         return None
 
-    def _is_name_match(self, dir_name, installed_name):
-        dir_name_clean = dir_name.replace(" ", "").replace("-", "").replace("_", "")
-        installed_clean = installed_name.replace(" ", "").replace("-", "").replace("_", "")
-
-        if dir_name_clean in installed_clean or installed_clean in dir_name_clean:
-            return True
-
-        return False
-
     def _is_name_match_any(self, dir_name):
-        for installed in self.installed_software:
-            if self._is_name_match(dir_name, installed):
-                return True
-        return False
+        return self.name_matcher.matches(dir_name)
 
     def _has_uninstall_exe(self, dir_path):
+        key = os.path.normcase(dir_path)
+        cached = self._uninstaller_cache.get(key)
+        if cached is None:
+            cached = self._probe_uninstaller(dir_path, UNINSTALLER_PROBE_DEPTH)
+            self._uninstaller_cache[key] = cached
+        return cached
+
+    def _probe_uninstaller(self, dir_path, max_depth):
+        pending = [(dir_path, 0)]
         try:
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    file_lower = file.lower()
+            while pending:
+                current, depth = pending.pop(0)
+                for entry in self._list_dir(current):
+                    if entry.is_dir:
+                        if depth < max_depth:
+                            pending.append((entry.path, depth + 1))
+                        continue
+                    file_lower = os.path.basename(entry.path).lower()
                     if "uninstall" in file_lower and file_lower.endswith('.exe'):
                         return True
-        except Exception:
+        except Exception as e:
+            self._record_error(dir_path, e)
             pass
         return False
 
-    def _scan_appdata_residuals(self):
-        results = {}
+    def _scan_appdata_residuals(self, cancel=None):
+        return self._run_jobs(self._appdata_residual_jobs(), cancel)
+
+    def _appdata_residual_jobs(self):
+        jobs = []
 
         appdata_dirs = [
-            os.environ.get("APPDATA", ""),
-            os.environ.get("LOCALAPPDATA", ""),
-            os.environ.get("PROGRAMDATA", "")
+            self.backend.folder("appdata"),
+            self.backend.folder("local_appdata"),
+            self.backend.folder("program_data")
         ]
 
         for appdata_dir in appdata_dirs:
-            if not appdata_dir or not os.path.exists(appdata_dir):
-                continue
+            if appdata_dir and os.path.exists(appdata_dir):
+                jobs.append(ScanJob("appdata_residual", self._scan_appdata_dir, (appdata_dir,), None))
 
-            try:
-                for item in os.listdir(appdata_dir):
-                    item_path = os.path.join(appdata_dir, item)
-                    if os.path.isdir(item_path):
-                        residual_info = self._is_residual_appdata_directory(item, item_path)
-                        if residual_info:
-                            size = self._get_dir_size(item_path)
-                            if size > 0:
-                                file_id = f"appdata_residual_{len(results)}"
-                                results[file_id] = {
-                                    "category": f"软件残留 ({residual_info})",
-                                    "path": item_path,
-                                    "size": size
-                                }
-            except Exception:
-                continue
+        return jobs
 
-        return results
+    def _scan_appdata_dir(self, appdata_dir):
+        try:
+            for entry in self._list_dir(appdata_dir):
+                if self._is_cancelled():
+                    return
+                if entry.is_dir:
+                    item_path = entry.path
+                    residual_info = self._is_residual_appdata_directory(os.path.basename(item_path), item_path)
+                    if residual_info:
+                        size = self._get_dir_size(item_path)
+                        if self._is_cancelled():
+                            return
+                        if size > 0:
+                            yield f"软件残留 ({residual_info})", item_path, size
+        except Exception as e:
+            self._record_error(appdata_dir, e)
+            return
 
     def _is_residual_appdata_directory(self, dir_name, dir_path):
-        dir_name_lower = dir_name.lower()
+        return self._classify_residual(dir_name, dir_path, ())
 
-        for installed in self.installed_software:
-            if self._is_name_match(dir_name_lower, installed):
-                return None
+    def _scan_invalid_shortcuts(self, cancel=None):
+        return self._run_jobs(self._invalid_shortcut_jobs(), cancel)
 
-        for pattern in self.common_residual_patterns:
-            if pattern in dir_name_lower:
-                if not self._is_name_match_any(dir_name_lower):
-                    return f"常见残留 ({pattern})"
-
-        return None
+    def _invalid_shortcut_jobs(self):
+        jobs = []
 
-    def _scan_invalid_shortcuts(self):
-        results = {}
-
-        desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-        start_menu_path = os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs")
-        public_start_menu = os.path.join(os.environ.get("PROGRAMDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs")
+        desktop_path = self.backend.folder("desktop")
+        start_menu_path = os.path.join(self.backend.folder("appdata"), "Microsoft", "Windows", "Start Menu", "Programs")
+        public_start_menu = os.path.join(self.backend.folder("program_data"), "Microsoft", "Windows", "Start Menu", "Programs")
 
         shortcut_paths = [desktop_path, start_menu_path, public_start_menu]
 
         for shortcut_dir in shortcut_paths:
-            if not shortcut_dir or not os.path.exists(shortcut_dir):
-                continue
+            if shortcut_dir and os.path.exists(shortcut_dir):
+                jobs.append(ScanJob("invalid_shortcut", self._scan_shortcut_dir, (shortcut_dir,), None))
 
-            try:
-                for root, dirs, files in os.walk(shortcut_dir):
-                    for file in files:
-                        if file.lower().endswith('.lnk'):
-                            shortcut_path = os.path.join(root, file)
-                            if self._is_invalid_shortcut(shortcut_path):
-                                try:
-                                    size = os.path.getsize(shortcut_path)
-                                    file_id = f"invalid_shortcut_{len(results)}"
-                                    results[file_id] = {
-                                        "category": "无效快捷方式",
-                                        "path": shortcut_path,
-                                        "size": size
-                                    }
-                                except Exception:
-                                    continue
-            except Exception:
-                continue
+        return jobs
 
-        return results
-
-    def _is_invalid_shortcut(self, shortcut_path):
+    def _scan_shortcut_dir(self, shortcut_dir):
         try:
-            import pythoncom
-            from win32com.shell import shell, shellcon
+            shortcuts = {
+                entry.path: entry.size
+                for entry in iter_files(shortcut_dir, None, self._observer(), self._cancel_token())
+                if entry.path.lower().endswith('.lnk')
+            }
+            for shortcut_path in find_invalid_shortcuts(
+                shortcuts, self._shortcut_target_cache, resolve=self.backend.read_link_target
+            ):
+                yield "无效快捷方式", shortcut_path, shortcuts[shortcut_path]
+        except Exception as e:
+            self._record_error(shortcut_dir, e)
+            return
 
-            shell_link = pythoncom.CoCreateInstance(
-                shell.CLSID_ShellLink,
-                None,
-                pythoncom.CLSCTX_INPROC_SERVER,
-                shell.IID_IShellLink
-            )
-
-            persist_file = shell_link.QueryInterface(pythoncom.IID_IPersistFile)
-            persist_file.Load(shortcut_path)
-
-            target = shell_link.GetPath(shell.SLGP_SHORTPATH)[0]
-
-            if not target:
-                return True
+    def _is_invalid_shortcut(self, shortcut_path):
+        return bool(find_invalid_shortcuts(
+            [shortcut_path], self._shortcut_target_cache, resolve=self.backend.read_link_target
+        ))
 
-            if os.path.exists(target):
-                return False
+    def _scan_temp_files(self, cancel=None, top_n=None, min_size=None):
+        return self._run_jobs(self._temp_file_jobs(), cancel, top_n, min_size)
 
-            return True
-        except Exception:
-            return False
-
-    def _scan_temp_files(self):
-        results = {}
+    def _temp_file_jobs(self):
+        jobs = []
 
         for temp_dir in self.temp_dirs:
-            if not temp_dir or not os.path.exists(temp_dir):
-                continue
-
-            try:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            file_id = f"temp_{len(results)}"
-                            results[file_id] = {
-                                "category": "临时文件",
-                                "path": file_path,
-                                "size": size
-                            }
-                        except Exception:
-                            continue
-            except Exception:
-                continue
-
-        return results
-
-    def _scan_browser_cache(self):
-        results = {}
+            if temp_dir and os.path.exists(temp_dir):
+                jobs.append(ScanJob("temp", self._scan_files, ("临时文件", temp_dir), temp_dir))
 
-        for category, cache_dir in self.browser_cache_dirs:
-            if not os.path.exists(cache_dir):
-                continue
+        return jobs
 
-            try:
-                for root, dirs, files in os.walk(cache_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            file_id = f"browser_{len(results)}"
-                            results[file_id] = {
-                                "category": category,
-                                "path": file_path,
-                                "size": size
-                            }
-                        except Exception:
-                            continue
-            except Exception:
-                continue
-
-        return results
-
-    def _scan_edge_dirs(self):
-        results = {}
+    def _scan_files(self, category, root, excludes=frozenset(), name_filter=None):
+        if name_filter is not None:
+            excludes = name_filter.with_paths(excludes)
+        try:
+            for entry in iter_files(root, excludes, self._observer(), self._cancel_token()):
+                if name_filter is None or name_filter.accepts(entry):
+                    yield category, entry.path, entry.size
+        except Exception as e:
+            self._record_error(root, e)
+            return
+
+    def _scan_dir_total(self, category, root, excludes=frozenset()):
+        try:
+            if os.path.isdir(root):
+                size = self._get_dir_size(root, excludes)
+                if size > 0 and not self._is_cancelled():
+                    yield category, root, size
+        except Exception as e:
+            self._record_error(root, e)
+            return
+
+    def _scan_rollup(self, depth, category, root, excludes=frozenset()):
+        try:
+            tree = size_tree(root, excludes, self._observer(), self._cancel_token(), depth)
+            if self._is_cancelled():
+                return
+            for entry in tree.report(depth):
+                if entry.size > 0:
+                    yield category, entry.path, entry.size
+        except Exception as e:
+            self._record_error(root, e)
+            return
 
-        for category, edge_dir in self.edge_dirs:
-            if not os.path.exists(edge_dir):
-                continue
+    def _scan_browser_cache(self, cancel=None, top_n=None, min_size=None):
+        return self._run_jobs(self._browser_cache_jobs(), cancel, top_n, min_size)
 
-            try:
-                if os.path.isdir(edge_dir):
-                    size = self._get_dir_size(edge_dir)
-                    if size > 0:
-                        file_id = f"edge_{len(results)}"
-                        results[file_id] = {
-                            "category": category,
-                            "path": edge_dir,
-                            "size": size
-                        }
-                else:
-                    for root, dirs, files in os.walk(edge_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            try:
-                                size = os.path.getsize(file_path)
-                                file_id = f"edge_{len(results)}"
-                                results[file_id] = {
-                                    "category": category,
-                                    "path": file_path,
-                                    "size": size
-                                }
-                            except Exception:
-                                continue
-            except Exception:
-                continue
+    def _browser_cache_jobs(self):
+        return self._rule_jobs(("browser",))
 
-        return results
+    def _scan_edge_dirs(self, cancel=None):
+        return self._run_jobs(self._edge_dir_jobs(), cancel)
 
-    def _scan_jianying_dirs(self):
-        results = {}
+    def _edge_dir_jobs(self):
+        return self._rule_jobs(("edge",))
 
-        for category, jianying_dir in self.jianying_dirs:
-            if not os.path.exists(jianying_dir):
-                continue
+    def _scan_jianying_dirs(self, cancel=None):
+        return self._run_jobs(self._jianying_dir_jobs(), cancel)
 
-            try:
-                if os.path.isdir(jianying_dir):
-                    size = self._get_dir_size(jianying_dir)
-                    if size > 0:
-                        file_id = f"jianying_{len(results)}"
-                        results[file_id] = {
-                            "category": category,
-                            "path": jianying_dir,
-                            "size": size
-                        }
-                else:
-                    for root, dirs, files in os.walk(jianying_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            try:
-                                size = os.path.getsize(file_path)
-                                file_id = f"jianying_{len(results)}"
-                                results[file_id] = {
-                                    "category": category,
-                                    "path": file_path,
-                                    "size": size
-                                }
-                            except Exception:
-                                continue
-            except Exception:
-                continue
+    def _jianying_dir_jobs(self):
+        return self._rule_jobs(("jianying",))
 
-        return results
+    def _scan_system_logs(self, cancel=None, top_n=None, min_size=None):
+        return self._run_jobs(self._system_log_jobs(), cancel, top_n, min_size)
 
-    def _scan_system_logs(self):
-        results = {}
+    def _system_log_jobs(self):
+        jobs = []
 
         for log_dir in self.log_dirs:
-            if not os.path.exists(log_dir):
-                continue
+            if os.path.exists(log_dir):
+                jobs.append(ScanJob("log", self._scan_files, ("系统日志", log_dir), log_dir))
 
-            try:
-                for root, dirs, files in os.walk(log_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            file_id = f"log_{len(results)}"
-                            results[file_id] = {
-                                "category": "系统日志",
-                                "path": file_path,
-                                "size": size
-                            }
-                        except Exception:
-                            continue
-            except Exception:
-                continue
-
-        prefetch_dir = os.path.join(os.environ.get("SYSTEMROOT", ""), "Prefetch")
+        prefetch_dir = os.path.join(self.backend.folder("windows"), "Prefetch")
         if os.path.exists(prefetch_dir):
-            try:
-                for file in os.listdir(prefetch_dir):
-                    if file.endswith(".pf"):
-                        file_path = os.path.join(prefetch_dir, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            file_id = f"prefetch_{len(results)}"
-                            results[file_id] = {
-                                "category": "预读取文件",
-                                "path": file_path,
-                                "size": size
-                            }
-                        except Exception:
-                            continue
-            except Exception:
-                pass
+            jobs.append(ScanJob("prefetch", self._scan_prefetch_dir, (prefetch_dir,), None))
 
-        return results
+        return jobs
+
+    def _scan_prefetch_dir(self, prefetch_dir):
+        try:
+            for entry in self._list_dir(prefetch_dir):
+                if not entry.is_dir and entry.path.endswith(".pf"):
+                    yield "预读取文件", entry.path, entry.size
+        except Exception as e:
+            self._record_error(prefetch_dir, e)
+            return
+
+    def _scan_recycle_bin(self, cancel=None, top_n=None, min_size=None):
+        return self._run_jobs(self._recycle_bin_jobs(), cancel, top_n, min_size)
 
-    def _scan_recycle_bin(self):
-        results = {}
+    def _recycle_bin_jobs(self):
+        jobs = []
 
-        drives = ["C:\\", "D:\\", "E:\\", "F:\\"]
+        drives = self.backend.drives()
 
         for drive in drives:
             if not os.path.exists(drive):
@@ -558,59 +737,63 @@ class DiskCleaner:
 
             recycle_path = os.path.join(drive, "$Recycle.Bin")
             if os.path.exists(recycle_path):
-                try:
-                    for root, dirs, files in os.walk(recycle_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            try:
-                                size = os.path.getsize(file_path)
-                                file_id = f"recycle_{len(results)}"
-                                results[file_id] = {
-                                    "category": "回收站",
-                                    "path": file_path,
-                                    "size": size
-                                }
-                            except Exception:
-                                continue
-                except Exception:
-                    continue
+                jobs.append(ScanJob("recycle", self._scan_files, ("回收站", recycle_path), recycle_path))
 
-        return results
+        return jobs
 
-    def clean_items(self, selected_items):
+    def clean_items(self, selected_items, max_workers=None, progress=None, stats=None, cancel=None):
         success_count = 0
         total_size = 0
 
-        for item_path in selected_items:
-            try:
-                if os.path.isfile(item_path):
-                    size = os.path.getsize(item_path)
-                    os.remove(item_path)
-                    success_count += 1
-                    total_size += size
-                elif os.path.isdir(item_path):
-                    size = self._get_dir_size(item_path)
-                    shutil.rmtree(item_path)
-                    success_count += 1
-                    total_size += size
-            except Exception as e:
-                continue
+        for result in self.delete_items(selected_items, max_workers, progress, stats, cancel):
+            total_size += result.freed
+            if result.ok:
+                success_count += 1
 
         return success_count, total_size
 
-    def _get_dir_size(self, path):
-        total_size = 0
+    def delete_items(self, selected_items, max_workers=None, progress=None, stats=None, cancel=None):
+        items = list(selected_items)
+        with self._phase(stats, "clean", items=len(items)):
+            results = self._delete_items(items, max_workers, progress, cancel)
+        if stats is not None:
+            self._record_clean(stats, items, results)
+        if cancel is not None and cancel.cancelled:
+            cancel.incomplete.add("clean")
+        return results
+
+    def _delete_items(self, items, max_workers=None, progress=None, cancel=None):
+        if max_workers is None:
+            max_workers = self.max_workers
+        engine = DeletionEngine(max_workers=max_workers)
+        if progress is None:
+            return engine.delete(items, cancel)
+
+        def report(index, freed, finished):
+            done = 1 if finished else 0
+            progress.advance(done, freed, getattr(items[index], "category", None), done)
+
+        progress.start("clean", len(items))
+        return engine.delete(items, cancel, report)
+
+    def _record_clean(self, stats, items, results):
+        recorders = {}
+        for item, result in zip(items, results):
+            category = getattr(item, "category", None)
+            recorder = recorders.get(category)
+            if recorder is None:
+                recorder = recorders[category] = stats.root("clean", None, category)
+            recorder.items += 1
+            recorder.bytes += result.freed
+            if result.error is not None:
+                recorder.error(result.path, result.error)
+
+    def _get_dir_size(self, path, excludes=None):
         try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                    except Exception:
-                        continue
-        except Exception:
-            pass
-        return total_size
+            return dir_size(path, excludes, self._observer(), self._cancel_token())
+        except Exception as e:
+            self._record_error(path, e)
+            return 0
 
     def clean_temp_files(self):
         cleaned_count = 0
@@ -621,16 +804,13 @@ class DiskCleaner:
                 continue
 
             try:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            os.remove(file_path)
-                            cleaned_count += 1
-                            total_size += size
-                        except Exception:
-                            continue
+                for entry in iter_files(temp_dir):
+                    try:
+                        os.remove(entry.path)
+                        cleaned_count += 1
+                        total_size += entry.size
+                    except Exception:
+                        continue
             except Exception:
                 continue
 
@@ -645,16 +825,13 @@ class DiskCleaner:
                 continue
 
             try:
-                for root, dirs, files in os.walk(cache_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            os.remove(file_path)
-                            cleaned_count += 1
-                            total_size += size
-                        except Exception:
-                            continue
+                for entry in iter_files(cache_dir):
+                    try:
+                        os.remove(entry.path)
+                        cleaned_count += 1
+                        total_size += entry.size
+                    except Exception:
+                        continue
             except Exception:
                 continue
 
@@ -669,30 +846,25 @@ class DiskCleaner:
                 continue
 
             try:
-                for root, dirs, files in os.walk(log_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            os.remove(file_path)
-                            cleaned_count += 1
-                            total_size += size
-                        except Exception:
-                            continue
+                for entry in iter_files(log_dir):
+                    try:
+                        os.remove(entry.path)
+                        cleaned_count += 1
+                        total_size += entry.size
+                    except Exception:
+                        continue
             except Exception:
                 continue
 
-        prefetch_dir = os.path.join(os.environ.get("SYSTEMROOT", ""), "Prefetch")
+        prefetch_dir = os.path.join(self.backend.folder("windows"), "Prefetch")
         if os.path.exists(prefetch_dir):
             try:
-                for file in os.listdir(prefetch_dir):
-                    if file.endswith(".pf"):
-                        file_path = os.path.join(prefetch_dir, file)
+                for entry in list_dir(prefetch_dir):
+                    if not entry.is_dir and entry.path.endswith(".pf"):
                         try:
-                            size = os.path.getsize(file_path)
-                            os.remove(file_path)
+                            os.remove(entry.path)
                             cleaned_count += 1
-                            total_size += size
+                            total_size += entry.size
                         except Exception:
                             continue
             except Exception:
@@ -704,7 +876,7 @@ class DiskCleaner:
         cleaned_count = 0
         total_size = 0
 
-        drives = ["C:\\", "D:\\", "E:\\", "F:\\"]
+        drives = self.backend.drives()
 
         for drive in drives:
             if not os.path.exists(drive):
@@ -713,16 +885,13 @@ class DiskCleaner:
             recycle_path = os.path.join(drive, "$Recycle.Bin")
             if os.path.exists(recycle_path):
                 try:
-                    for root, dirs, files in os.walk(recycle_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            try:
-                                size = os.path.getsize(file_path)
-                                os.remove(file_path)
-                                cleaned_count += 1
-                                total_size += size
-                            except Exception:
-                                continue
+                    for entry in iter_files(recycle_path):
+                        try:
+                            os.remove(entry.path)
+                            cleaned_count += 1
+                            total_size += entry.size
+                        except Exception:
+                            continue
                 except Exception:
                     continue
 
@@ -0,0 +1,236 @@
+import argparse
+import json
+import sys
+import time
+
+from cancel import CancelToken
+from cleaner import DiskCleaner, SCAN_CATEGORIES
+from results import ScanResultSet
+from rules import DEFAULT_RULES, load_rules
+from software_cache import SoftwareCache
+from stats import ScanStats
+
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+EXIT_INCOMPLETE = 4
+
+SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2, "G": 1024 ** 3, "GB": 1024 ** 3}
+
+
+def parse_size(value):
+    text = value.strip().upper()
+    number = text.rstrip("KMGB")
+    unit = text[len(number):]
+    if unit not in SIZE_UNITS:
+        raise argparse.ArgumentTypeError(f"无效的大小: {value}")
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的大小: {value}")
+
+
+def parse_count(value):
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的数量: {value}")
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"数量不能为负数: {value}")
+    return count
+
+
+def parse_budget(value):
+    category, sep, seconds = value.partition("=")
+    if not sep or not category:
+        raise argparse.ArgumentTypeError(f"无效的时间预算: {value}")
+    try:
+        return category, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的时间预算: {value}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="C盘深度清理工具（命令行版）")
+    parser.add_argument(
+        "-c", "--category", action="append", dest="categories", metavar="CATEGORY",
+        help=f"只扫描指定类别，可重复指定；默认扫描全部类别。可选 {', '.join(SCAN_CATEGORIES)}，"
+             "以及 --rules 规则文件中声明的 prefix"
+    )
+    parser.add_argument("--min-size", type=parse_size, default=0, help="忽略小于该大小的项目，如 10M")
+    parser.add_argument(
+        "--top", type=parse_count, default=None, metavar="N",
+        help="每个类别只保留最大的 N 个项目（以及不小于 --min-size 的项目），各类别和目录的总量仍精确统计"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--delete", action="store_true",
+        help="删除扫描到的项目（不可恢复）；不指定时只扫描并输出结果"
+    )
+    mode.add_argument("--dry-run", action="store_true", help="只扫描并输出结果，不删除任何文件（默认行为）")
+    parser.add_argument(
+        "--format", choices=("ndjson", "summary"), default="summary",
+        help="ndjson 逐行输出每个项目，summary 在结束时输出汇总 JSON"
+    )
+    parser.add_argument("-o", "--output", help="输出文件路径，默认写到标准输出")
+    parser.add_argument("--no-cache", action="store_true", help="不使用已安装软件缓存")
+    parser.add_argument("--workers", type=int, default=None, help="扫描和删除使用的线程数，不指定时逐个删除")
+    parser.add_argument(
+        "--depth", type=parse_count, default=None, metavar="N",
+        help="按文件夹汇总：每个扫描根目录下第 N 层的文件夹作为一个项目输出，0 表示整个根目录"
+    )
+    parser.add_argument("--timeout", type=float, default=None, help="整体时间预算（秒），超时后返回已扫描到的部分结果")
+    parser.add_argument(
+        "--budget", type=parse_budget, action="append", default=[], metavar="CATEGORY=SECONDS",
+        help="单个类别的扫描时间预算，如 recycle=30，可重复指定"
+    )
+    parser.add_argument(
+        "--rules", action="append", default=[], metavar="FILE",
+        help="额外加载的类别规则文件（JSON），在内置规则之后生效，可重复指定"
+    )
+    parser.add_argument("--stats", help="把各类别的耗时、目录数、文件数和错误统计写入 JSON 文件")
+    parser.add_argument("--trace", help="导出 Chrome trace / Perfetto 格式的时间线 JSON 文件")
+    return parser
+
+
+class Report:
+    def __init__(self, stream, ndjson):
+        self.stream = stream
+        self.ndjson = ndjson
+
+    def emit(self, record):
+        if self.ndjson:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+    def finish(self, summary):
+        if self.ndjson:
+            self.emit(dict(summary, type="summary"))
+        else:
+            json.dump(summary, self.stream, ensure_ascii=False, indent=2)
+            self.stream.write("\n")
+
+
+def check_categories(parser, args, rules):
+    known = list(SCAN_CATEGORIES) + [prefix for prefix in rules.prefixes() if prefix not in SCAN_CATEGORIES]
+    requested = list(args.categories or ()) + [category for category, seconds in args.budget]
+    unknown = [category for category in dict.fromkeys(requested) if category not in known]
+    if unknown:
+        parser.error(f"未知的类别: {', '.join(unknown)}（可选: {', '.join(known)}）")
+
+
+def run(args, stream, rules=None):
+    software_cache = None if args.no_cache else SoftwareCache()
+    if rules is None:
+        rules = load_rules(DEFAULT_RULES, *args.rules)
+    cleaner = DiskCleaner(max_workers=args.workers, rules=rules, software_cache=software_cache)
+    report = Report(stream, args.format == "ndjson")
+    stats = ScanStats() if args.stats or args.trace else None
+    cancel = CancelToken(args.timeout)
+    started = time.monotonic()
+
+    if args.top is None:
+        selected = ScanResultSet()
+        batches = cleaner.iter_scan(
+            categories=args.categories, stats=stats, cancel=cancel, budgets=dict(args.budget),
+            depth=args.depth
+        )
+        for batch in batches:
+            for category, path, size in batch:
+                if size < args.min_size:
+                    continue
+                selected.add(category, path, size)
+                report.emit({"type": "item", "category": category, "path": path, "size": size})
+    else:
+        selected = cleaner.scan_c_drive(
+            categories=args.categories, stats=stats,
+            cancel=cancel, budgets=dict(args.budget), top_n=args.top, min_size=args.min_size or None,
+            depth=args.depth
+        )
+        for index, category, path, size in selected:
+            report.emit({"type": "item", "category": category, "path": path, "size": size})
+
+    summary = {
+        "dry_run": not args.delete,
+        "items": len(selected),
+        "total_size": selected.total_size(),
+        "categories": {
+            category: {"count": count, "size": total_size}
+            for category, (count, total_size) in selected.category_totals().items()
+        },
+        "partial": cancel.partial,
+        "incomplete": sorted(cancel.incomplete),
+    }
+    if args.top is not None:
+        omitted_count, omitted_size = selected.omitted()
+        summary.update(
+            retained_size=selected.retained_size(),
+            omitted={"count": omitted_count, "size": omitted_size},
+            roots=[
+                {"category": category, "root": root, "count": count, "size": total_size}
+                for (category, root), (count, total_size) in selected.root_totals().items()
+            ],
+        )
+
+    exit_code = EXIT_INCOMPLETE if cancel.partial else EXIT_OK
+    if args.delete and selected:
+        cleaned = 0
+        freed = 0
+        failed = 0
+        for result in cleaner.delete_items(list(selected), args.workers, stats=stats, cancel=cancel):
+            freed += result.freed
+            if result.ok:
+                cleaned += 1
+            else:
+                failed += 1
+            report.emit({
+                "type": "deleted", "path": result.path, "ok": result.ok, "freed": result.freed,
+                "error": None if result.error is None else str(result.error),
+            })
+        summary.update(cleaned=cleaned, failed=failed, freed=freed)
+        summary.update(partial=cancel.partial, incomplete=sorted(cancel.incomplete))
+        if cancel.partial:
+            exit_code = EXIT_INCOMPLETE
+        elif failed:
+            exit_code = EXIT_PARTIAL
+
+    summary["elapsed"] = round(time.monotonic() - started, 3)
+    report.finish(summary)
+
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=2)
+    if args.trace:
+        stats.export_chrome_trace(args.trace)
+    return exit_code
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        rules = load_rules(DEFAULT_RULES, *args.rules)
+    except (OSError, ValueError) as e:
+        print(f"清理失败: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    check_categories(parser, args, rules)
+
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as stream:
+                return run(args, stream, rules)
+        if hasattr(sys.stdout, "reconfigure"):
+            sys.stdout.reconfigure(encoding="utf-8")
+        return run(args, sys.stdout, rules)
+    except KeyboardInterrupt:
+        return EXIT_ERROR
+    except Exception as e:
+        print(f"清理失败: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
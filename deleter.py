@@ -0,0 +1,248 @@
+import os
+import stat
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+def _is_link(entry):
+    if entry.is_symlink():
+        return True
+    st = entry.stat(follow_symlinks=False)
+    return bool(getattr(st, "st_file_attributes", 0) & FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _is_link_stat(st):
+    return stat.S_ISLNK(st.st_mode) or bool(
+        getattr(st, "st_file_attributes", 0) & FILE_ATTRIBUTE_REPARSE_POINT
+    )
+
+
+def _remove_link(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        os.rmdir(path)
+
+
+def remove_file(path):
+    size = os.stat(path).st_size
+    os.remove(path)
+    return size
+
+
+def remove_tree(path, cancel=None):
+    freed = 0
+    errors = 0
+    stack = [(path, False)]
+
+    while stack:
+        if cancel is not None and cancel.cancelled:
+            return freed, False
+        current, listed = stack.pop()
+        if listed:
+            try:
+                os.rmdir(current)
+            except OSError:
+                errors += 1
+            continue
+
+        stack.append((current, True))
+        try:
+            it = os.scandir(current)
+        except OSError:
+            errors += 1
+            continue
+
+        with it:
+            entries = list(it)
+
+        for entry in entries:
+            try:
+                if _is_link(entry):
+                    _remove_link(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, False))
+                else:
+                    size = entry.stat(follow_symlinks=False).st_size
+                    os.remove(entry.path)
+                    freed += size
+            except OSError:
+                errors += 1
+
+    return freed, errors == 0
+
+
+DEFAULT_DELETE_WORKERS = 1
+
+DeleteResult = namedtuple("DeleteResult", ["path", "ok", "freed", "error"])
+DeletePlan = namedtuple("DeletePlan", ["files", "dirs", "error"])
+
+
+def _cancelled_error():
+    return InterruptedError("清理已取消")
+
+
+class DeletionEngine:
+    def __init__(self, max_workers=None):
+        self.max_workers = max(1, max_workers or DEFAULT_DELETE_WORKERS)
+        self.cancel = None
+
+    def delete(self, items, cancel=None, on_progress=None):
+        items = [self._normalize(item) for item in items]
+        self.cancel = cancel
+
+        def report(index, size, finished):
+            if on_progress is not None:
+                on_progress(index, size, finished)
+
+        if self.max_workers <= 1:
+            results = []
+            for index, path in enumerate(items):
+                result = self._delete_serial(path)
+                results.append(result)
+                report(index, result.freed, True)
+            return results
+
+        freed = [0] * len(items)
+        errors = [None] * len(items)
+
+        def record_error(index, error):
+            if errors[index] is None:
+                errors[index] = error
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            plans = list(executor.map(self._plan_item, items))
+
+            by_parent = defaultdict(list)
+            by_depth = defaultdict(list)
+            for index, plan in enumerate(plans):
+                if plan.error is not None:
+                    record_error(index, plan.error)
+                for path, size, is_link in plan.files:
+                    by_parent[os.path.dirname(path)].append((index, path, size, is_link))
+                for path in plan.dirs:
+                    by_depth[path.count(os.sep)].append((index, path))
+                if not plan.files and not plan.dirs:
+                    report(index, 0, True)
+
+            for outcome in executor.map(self._unlink_group, by_parent.values()):
+                group_freed = defaultdict(int)
+                for index, size, error in outcome:
+                    freed[index] += size
+                    group_freed[index] += size
+                    if error is not None:
+                        record_error(index, error)
+                for index, size in group_freed.items():
+                    report(index, size, not plans[index].dirs)
+
+            for depth in sorted(by_depth, reverse=True):
+                level = by_depth[depth]
+                if self._cancelled():
+                    for index, path in level:
+                        record_error(index, _cancelled_error())
+                else:
+                    for index, error in executor.map(self._rmdir, level):
+                        if error is not None:
+                            record_error(index, error)
+                for index, path in level:
+                    if path == items[index]:
+                        report(index, 0, True)
+
+        return [
+            DeleteResult(path, errors[index] is None, freed[index], errors[index])
+            for index, path in enumerate(items)
+        ]
+
+    def _cancelled(self):
+        return self.cancel is not None and self.cancel.cancelled
+
+    def _normalize(self, item):
+        if isinstance(item, str):
+            return item
+        return item.path
+
+    def _delete_serial(self, path):
+        if self._cancelled():
+            return DeleteResult(path, False, 0, _cancelled_error())
+        try:
+            st = os.lstat(path)
+            if _is_link_stat(st):
+                _remove_link(path)
+                return DeleteResult(path, True, 0, None)
+            if stat.S_ISDIR(st.st_mode):
+                freed, removed = remove_tree(path, self.cancel)
+                if not removed and self._cancelled():
+                    return DeleteResult(path, False, freed, _cancelled_error())
+                return DeleteResult(path, removed, freed, None if removed else OSError("目录未完全删除"))
+            return DeleteResult(path, True, remove_file(path), None)
+        except OSError as e:
+            return DeleteResult(path, False, 0, e)
+
+    def _plan_item(self, path):
+        if self._cancelled():
+            return DeletePlan([], [], _cancelled_error())
+        try:
+            st = os.lstat(path)
+        except OSError as e:
+            return DeletePlan([], [], e)
+
+        is_link = _is_link_stat(st)
+        if is_link or not stat.S_ISDIR(st.st_mode):
+            size = 0 if is_link else st.st_size
+            return DeletePlan([(path, size, is_link)], [], None)
+
+        files = []
+        dirs = []
+        error = None
+        stack = [path]
+        while stack:
+            if self._cancelled():
+                return DeletePlan(files, dirs, _cancelled_error())
+            current = stack.pop()
+            dirs.append(current)
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as e:
+                error = error or e
+                continue
+
+            for entry in entries:
+                try:
+                    if _is_link(entry):
+                        files.append((entry.path, 0, True))
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        files.append((entry.path, entry.stat(follow_symlinks=False).st_size, False))
+                except OSError as e:
+                    error = error or e
+
+        return DeletePlan(files, dirs, error)
+
+    def _unlink_group(self, group):
+        outcome = []
+        for index, path, size, is_link in group:
+            if self._cancelled():
+                outcome.append((index, 0, _cancelled_error()))
+                continue
+            try:
+                if is_link:
+                    _remove_link(path)
+                else:
+                    os.remove(path)
+                outcome.append((index, size, None))
+            except OSError as e:
+                outcome.append((index, 0, e))
+        return outcome
+
+    def _rmdir(self, item):
+        index, path = item
+        try:
+            os.rmdir(path)
+            return index, None
+        except OSError as e:
+            return index, e
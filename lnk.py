@@ -0,0 +1,253 @@
+import locale
+import os
+import struct
+
+
+HEADER_SIZE = 0x4C
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+FORCE_NO_LINK_INFO = 0x00000100
+HAS_DARWIN_ID = 0x00001000
+
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x2
+
+ENVIRONMENT_VARIABLE_BLOCK = 0xA0000001
+FILE_ENTRY_EXTENSION = 0xBEEF0004
+EXTENSION_NAME_OFFSETS = {3: 20, 7: 38, 8: 42, 9: 46}
+
+MAX_LINK_SIZE = 1 << 20
+
+try:
+    "".encode("mbcs")
+    ANSI_ENCODING = "mbcs"
+except LookupError:
+    ANSI_ENCODING = locale.getpreferredencoding(False)
+
+
+class LinkFormatError(ValueError):
+    pass
+
+
+class ShellLink:
+    def __init__(self, flags, local_path=None, network_path=None, env_path=None, id_list_path=None):
+        self.flags = flags
+        self.local_path = local_path
+        self.network_path = network_path
+        self.env_path = env_path
+        self.id_list_path = id_list_path
+
+    @property
+    def is_advertised(self):
+        return bool(self.flags & HAS_DARWIN_ID)
+
+    @property
+    def target(self):
+        if self.is_advertised or self.network_path:
+            return None
+        if self.local_path:
+            return self.local_path
+        if self.env_path:
+            return os.path.expandvars(self.env_path)
+        return self.id_list_path
+
+
+def _u16(data, offset):
+    if offset + 2 > len(data):
+        raise LinkFormatError("truncated")
+    return struct.unpack_from("<H", data, offset)[0]
+
+
+def _u32(data, offset):
+    if offset + 4 > len(data):
+        raise LinkFormatError("truncated")
+    return struct.unpack_from("<I", data, offset)[0]
+
+
+def _ansi_string(data, offset, end=None):
+    end = len(data) if end is None else end
+    stop = data.find(b"\x00", offset, end)
+    if stop < 0:
+        stop = end
+    return data[offset:stop].decode(ANSI_ENCODING, errors="replace")
+
+
+def _unicode_string(data, offset, end=None):
+    end = len(data) if end is None else end
+    stop = offset
+    while stop + 1 < end and data[stop:stop + 2] != b"\x00\x00":
+        stop += 2
+    return data[offset:stop].decode("utf-16-le", errors="replace")
+
+
+def _parse_link_info(data, offset):
+    size = _u32(data, offset)
+    end = offset + size
+    if size < 0x1C or end > len(data):
+        raise LinkFormatError("bad LinkInfo size")
+
+    header_size = _u32(data, offset + 4)
+    flags = _u32(data, offset + 8)
+    local_base_offset = _u32(data, offset + 16)
+    network_offset = _u32(data, offset + 20)
+    suffix_offset = _u32(data, offset + 24)
+    unicode = header_size >= 0x24
+
+    local_path = None
+    network_path = None
+
+    if unicode and _u32(data, offset + 32):
+        suffix = _unicode_string(data, offset + _u32(data, offset + 32), end)
+    else:
+        suffix = _ansi_string(data, offset + suffix_offset, end)
+
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if unicode and _u32(data, offset + 28):
+            base = _unicode_string(data, offset + _u32(data, offset + 28), end)
+        else:
+            base = _ansi_string(data, offset + local_base_offset, end)
+        local_path = base + suffix
+
+    if flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX:
+        net_start = offset + network_offset
+        net_name = _ansi_string(data, net_start + _u32(data, net_start + 8), end)
+        network_path = net_name + ("\\" + suffix if suffix else "")
+
+    return end, local_path, network_path
+
+
+def _skip_string_data(data, offset, flags):
+    char_size = 2 if flags & IS_UNICODE else 1
+    for flag in (HAS_NAME, HAS_RELATIVE_PATH, HAS_WORKING_DIR, HAS_ARGUMENTS, HAS_ICON_LOCATION):
+        if flags & flag:
+            offset += 2 + _u16(data, offset) * char_size
+    return offset
+
+
+def _parse_extra_data(data, offset):
+    while offset + 8 <= len(data):
+        block_size = _u32(data, offset)
+        if block_size < 8 or offset + block_size > len(data):
+            break
+        if _u32(data, offset + 4) == ENVIRONMENT_VARIABLE_BLOCK and block_size >= 0x314:
+            target = _unicode_string(data, offset + 268, offset + 788)
+            return target or _ansi_string(data, offset + 8, offset + 268)
+        offset += block_size
+    return None
+
+
+def _file_entry_name(item):
+    item_type = item[2]
+    primary_unicode = bool(item_type & 0x04)
+    if primary_unicode:
+        name = _unicode_string(item, 14)
+    else:
+        name = _ansi_string(item, 14)
+
+    extension_offset = _u16(item, len(item) - 2)
+    if 14 <= extension_offset < len(item) - 8 and _u32(item, extension_offset + 4) == FILE_ENTRY_EXTENSION:
+        version = _u16(item, extension_offset + 2)
+        name_offset = EXTENSION_NAME_OFFSETS.get(version, 46 if version > 9 else None)
+        if name_offset is not None:
+            long_name = _unicode_string(item, extension_offset + name_offset, len(item) - 2)
+            if long_name:
+                return long_name
+
+    return name
+
+
+def _parse_id_list(data, offset):
+    list_size = _u16(data, offset)
+    start = offset + 2
+    end = start + list_size
+    if end > len(data):
+        raise LinkFormatError("bad IDList size")
+
+    parts = []
+    position = start
+    while position + 2 <= end:
+        item_size = _u16(data, position)
+        if item_size == 0:
+            break
+        if item_size < 3 or position + item_size > end:
+            raise LinkFormatError("bad ItemID size")
+        item = data[position:position + item_size]
+        class_type = item[2] & 0x70
+
+        if class_type == 0x20:
+            parts = [_ansi_string(item, 3).rstrip("\\") + "\\"]
+        elif class_type == 0x30 and parts:
+            parts.append(_file_entry_name(item))
+
+        position += item_size
+
+    path = None
+    if parts:
+        path = parts[0] + "\\".join(parts[1:])
+    return end, path
+
+
+def parse_link(data):
+    if len(data) < HEADER_SIZE or _u32(data, 0) != HEADER_SIZE or data[4:20] != LINK_CLSID:
+        raise LinkFormatError("not a shell link")
+
+    flags = _u32(data, 20)
+    offset = HEADER_SIZE
+    id_list_path = None
+    local_path = None
+    network_path = None
+
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        offset, id_list_path = _parse_id_list(data, offset)
+
+    if flags & HAS_LINK_INFO:
+        offset, local_path, network_path = _parse_link_info(data, offset)
+        if flags & FORCE_NO_LINK_INFO:
+            local_path = network_path = None
+
+    offset = _skip_string_data(data, offset, flags)
+    env_path = _parse_extra_data(data, offset)
+
+    return ShellLink(flags, local_path, network_path, env_path, id_list_path)
+
+
+def read_link(path):
+    with open(path, "rb") as f:
+        return parse_link(f.read(MAX_LINK_SIZE))
+
+
+def read_link_target(path):
+    try:
+        return read_link(path).target
+    except (OSError, LinkFormatError):
+        return None
+
+
+def find_invalid_shortcuts(shortcut_paths, target_cache=None, exists=os.path.exists, resolve=read_link_target):
+    if target_cache is None:
+        target_cache = {}
+
+    by_target = {}
+    for shortcut_path in shortcut_paths:
+        target = resolve(shortcut_path)
+        if target:
+            by_target.setdefault(os.path.normcase(target), (target, []))[1].append(shortcut_path)
+
+    invalid = []
+    for key, (target, shortcuts) in by_target.items():
+        found = target_cache.get(key)
+        if found is None:
+            found = exists(target)
+            target_cache[key] = found
+        if not found:
+            invalid.extend(shortcuts)
+
+    return invalid
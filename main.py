@@ -2,19 +2,51 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
 from cleaner import DiskCleaner
+from results import ScanResultSet
+from software_cache import SoftwareCache
+from selection import SelectionModel
+from progress import ProgressChannel
+from cancel import CancelToken
 import os
 
 
+PROGRESS_POLL_MS = 100
+LOG_MAX_LINES = 1000
+TREE_PAGE_SIZE = 500
+ROLLUP_DEPTH = 1
+
+JIANYING_CATEGORIES = (
+    "剪映如下缓存内容", "剪映音频缓存", "剪映工作平台缓存",
+    "剪映艺术特效缓存", "剪映临时文件", "剪映预览缓存", "剪映导出缓存"
+)
+
+
 class DiskCleanerApp:
     def __init__(self, root):
         self.root = root
         self.root.title("C盘深度清理工具")
         self.root.geometry("900x700")
-        self.cleaner = DiskCleaner()
-        self.scan_results = {}
+        self.cleaner = DiskCleaner(software_cache=SoftwareCache())
+        self.scan_results = ScanResultSet()
+        self.progress_channel = None
+        self.cancel_token = None
+        self.pending_log = []
+        self._reset_tree_state()
+        self.setup_ui()
+        self.root.after_idle(self.cleaner.prefetch_installed_software)
+
+    def _reset_tree_state(self):
         self.category_nodes = {}
+        self.node_categories = {}
+        self.category_totals = {}
+        self.selection = SelectionModel()
+        self.category_loaded = {}
+        self.placeholder_nodes = {}
+        self.more_nodes = {}
+        self.category_more = {}
         self.item_nodes = {}
-        self.setup_ui()
+        self.node_indices = {}
+        self.total_size = 0
 
     def setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="10")
@@ -50,6 +82,14 @@ class DiskCleanerApp:
         )
         self.scan_button.pack(side=tk.LEFT, padx=5)
 
+        self.rollup_var = tk.BooleanVar(value=False)
+        self.rollup_check = ttk.Checkbutton(
+            button_frame,
+            text="按文件夹汇总",
+            variable=self.rollup_var
+        )
+        self.rollup_check.pack(side=tk.LEFT, padx=5)
+
         self.clean_button = ttk.Button(
             button_frame,
             text="清理选中",
@@ -59,6 +99,15 @@ class DiskCleanerApp:
         )
         self.clean_button.pack(side=tk.LEFT, padx=5)
 
+        self.stop_button = ttk.Button(
+            button_frame,
+            text="停止",
+            command=self.stop,
+            width=10,
+            state=tk.DISABLED
+        )
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+
         ttk.Separator(button_frame, orient=tk.VERTICAL).pack(side=tk.LEFT, padx=10, fill=tk.Y)
 
         self.expand_all_button = ttk.Button(
@@ -127,6 +176,7 @@ class DiskCleanerApp:
 
         self.tree.bind("<Button-1>", self.on_tree_click)
         self.tree.bind("<Double-1>", self.on_tree_double_click)
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
 
         status_frame = ttk.Frame(main_frame)
         status_frame.grid(row=4, column=0, sticky=(tk.W, tk.E))
@@ -140,7 +190,7 @@ class DiskCleanerApp:
 
         self.progress = ttk.Progressbar(
             status_frame,
-            mode="indeterminate",
+            mode="determinate",
             length=200
         )
         self.progress.pack(side=tk.RIGHT)
@@ -154,8 +204,21 @@ class DiskCleanerApp:
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
     def log(self, message):
+        if not self.pending_log:
+            self.root.after_idle(self._flush_log)
+        self.pending_log.append(message)
+
+    def _flush_log(self):
+        if not self.pending_log:
+            return
+        lines = self.pending_log[-LOG_MAX_LINES:]
+        self.pending_log = []
+
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, f"{message}\n")
+        self.log_text.insert(tk.END, "".join(f"{line}\n" for line in lines))
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
 
@@ -165,58 +228,107 @@ class DiskCleanerApp:
             column = self.tree.identify_column(event.x)
             if column == "#4":
                 item = self.tree.identify_row(event.y)
-                if item:
-                    current_value = self.tree.set(item, "selected")
-                    new_value = "是" if current_value == "否" else "否"
-                    self.tree.set(item, "selected", new_value)
-
-                    parent = self.tree.parent(item)
-                    if parent:
-                        self._update_parent_selection(parent)
+                if item in self.node_categories:
+                    category = self.node_categories[item]
+                    self._select_category(category, self.selection.category_state(category) != "是")
+                elif item in self.node_indices:
+                    index = self.node_indices[item]
+                    category = self.scan_results.category(index)
+                    self.selection.toggle(index, category)
+                    self.tree.set(item, "selected", self._selected_label(index))
+                    self._refresh_category_selection(category)
 
     def on_tree_double_click(self, event):
         item = self.tree.identify_row(event.y)
-        if item:
+        if item in self.more_nodes:
+            self._load_category_page(self.more_nodes[item])
+        elif item:
             if self.tree.item(item, "open"):
                 self.tree.item(item, open=False)
             else:
                 self.tree.item(item, open=True)
-
-    def _update_parent_selection(self, parent):
-        children = self.tree.get_children(parent)
-        if not children:
+                self.on_tree_open(item=item)
+
+    def on_tree_open(self, event=None, item=None):
+        if item is None:
+            item = self.tree.focus()
+        category = self.node_categories.get(item)
+        if category in self.placeholder_nodes:
+            self._load_category_page(category)
+
+    def _load_category_page(self, category):
+        category_node = self.category_nodes[category]
+        placeholder = self.placeholder_nodes.pop(category, None)
+        if placeholder is not None:
+            self.tree.delete(placeholder)
+        more_node = self.category_more.pop(category, None)
+        if more_node is not None:
+            del self.more_nodes[more_node]
+            self.tree.delete(more_node)
+
+        members = self.selection.members[category]
+        start = self.category_loaded[category]
+        end = min(start + TREE_PAGE_SIZE, len(members))
+        for index in members[start:end]:
+            item_node = self.tree.insert(category_node, tk.END, text="", values=(
+                self.scan_results.path(index),
+                self.format_size(self.scan_results.size(index)),
+                self._selected_label(index)
+            ))
+            self.item_nodes[index] = item_node
+            self.node_indices[item_node] = index
+        self.category_loaded[category] = end
+        self._refresh_more_node(category)
+
+    def _refresh_more_node(self, category):
+        if category in self.placeholder_nodes:
             return
-
-        all_selected = all(self.tree.set(child, "selected") == "是" for child in children)
-        none_selected = all(self.tree.set(child, "selected") == "否" for child in children)
-
-        if all_selected:
-            self.tree.set(parent, "selected", "是")
-        elif none_selected:
-            self.tree.set(parent, "selected", "否")
-        else:
-            self.tree.set(parent, "selected", "部分")
-
-        grandparent = self.tree.parent(parent)
-        if grandparent:
-            self._update_parent_selection(grandparent)
+        remaining = len(self.selection.members[category]) - self.category_loaded[category]
+        if remaining <= 0:
+            return
+        more_node = self.category_more.get(category)
+        if more_node is not None:
+            self.tree.set(more_node, "path", f"还有 {remaining} 项，双击加载")
+            return
+        more_node = self.tree.insert(self.category_nodes[category], tk.END, text="加载更多...", values=(
+            f"还有 {remaining} 项，双击加载",
+            "",
+            ""
+        ))
+        self.more_nodes[more_node] = category
+        self.category_more[category] = more_node
+
+    def _selected_label(self, index):
+        return "是" if self.selection.is_selected(index) else "否"
+
+    def _refresh_category_selection(self, category):
+        self.tree.set(self.category_nodes[category], "selected", self.selection.category_state(category))
+
+    def _select_category(self, category, select):
+        self.selection.set_category(category, select)
+        self._refresh_category_rows(category)
+
+    def _refresh_category_rows(self, category):
+        self._refresh_category_selection(category)
+        members = self.selection.members[category]
+        for index in members[:self.category_loaded[category]]:
+            self.tree.set(self.item_nodes[index], "selected", self._selected_label(index))
 
     def select_all(self):
-        for item in self.tree.get_children():
-            self._select_recursive(item, True)
+        self.selection.set_all(True)
+        for category in self.category_nodes:
+            self._refresh_category_rows(category)
 
     def deselect_all(self):
-        for item in self.tree.get_children():
-            self._select_recursive(item, False)
-
-    def _select_recursive(self, item, select):
-        self.tree.set(item, "selected", "是" if select else "否")
-        for child in self.tree.get_children(item):
-            self._select_recursive(child, select)
+        self.selection.set_all(False)
+        for category in self.category_nodes:
+            self._refresh_category_rows(category)
 
     def expand_all(self):
-        for item in self.tree.get_children():
-            self._expand_recursive(item)
+        for category, category_node in self.category_nodes.items():
+            if category in self.placeholder_nodes:
+                self._load_category_page(category)
+            self._expand_recursive(category_node)
 
     def collapse_all(self):
         for item in self.tree.get_children():
@@ -233,86 +345,166 @@ class DiskCleanerApp:
             self._collapse_recursive(child)
 
     def start_scan(self):
-        self.scan_button.config(state=tk.DISABLED)
-        self.clean_button.config(state=tk.DISABLED)
-        self.select_all_button.config(state=tk.DISABLED)
-        self.deselect_all_button.config(state=tk.DISABLED)
-        self.expand_all_button.config(state=tk.DISABLED)
-        self.collapse_all_button.config(state=tk.DISABLED)
-        self.progress.start()
+        self._set_busy(True)
         self.status_label.config(text="正在扫描...")
         self.log("开始扫描C盘...")
 
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        self.category_nodes = {}
-        self.item_nodes = {}
-
-        thread = threading.Thread(target=self.scan)
+        self.scan_results = ScanResultSet()
+        self._reset_tree_state()
+        self.progress_channel = ProgressChannel()
+        self.cancel_token = CancelToken()
+        self.progress.config(value=0, maximum=1)
+
+        depth = ROLLUP_DEPTH if self.rollup_var.get() else None
+        thread = threading.Thread(
+            target=self.scan,
+            args=(self.progress_channel, self.cancel_token, depth),
+            daemon=True
+        )
         thread.start()
+        self.root.after(PROGRESS_POLL_MS, self._poll_progress, self.progress_channel)
 
-    def scan(self):
+    def scan(self, channel, cancel, depth=None):
         try:
-            self.scan_results = self.cleaner.scan_c_drive()
-
-            self.root.after(0, self.display_results)
-            self.root.after(0, lambda: self.status_label.config(text=f"扫描完成！发现 {len(self.scan_results)} 个可清理项"))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.scan_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.clean_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.select_all_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.deselect_all_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.expand_all_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.collapse_all_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.log(f"扫描完成！发现 {len(self.scan_results)} 个可清理项"))
+            batches = self.cleaner.iter_scan(progress=channel, cancel=cancel, depth=depth)
+            for batch in batches:
+                channel.post("batch", batch)
+            channel.post("scan_done")
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("错误", f"扫描失败: {str(e)}"))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.scan_button.config(state=tk.NORMAL))
+            channel.post("scan_failed", e)
 
-    def display_results(self):
-        total_size = 0
-        categories = {}
+    def _poll_progress(self, channel):
+        if channel is not self.progress_channel:
+            return
+
+        pending = []
+        finished = None
+        for kind, payload in channel.drain():
+            if kind == "batch":
+                pending.extend(payload)
+            elif kind == "log":
+                self.log(payload)
+            else:
+                finished = (kind, payload)
+
+        if pending:
+            start = len(self.scan_results)
+            self.scan_results.extend(pending)
+            self.display_results(range(start, len(self.scan_results)))
 
-        for item_id, data in self.scan_results.items():
-            category = data["category"]
-            size = data["size"]
-            total_size += size
+        self._show_progress(channel.snapshot())
+        self._flush_log()
 
+        if finished is None:
+            self.root.after(PROGRESS_POLL_MS, self._poll_progress, channel)
+            return
+
+        kind, payload = finished
+        if kind == "scan_done":
+            self._finish_scan()
+        elif kind == "scan_failed":
+            self._fail_scan(payload)
+        elif kind == "clean_done":
+            self._finish_clean(*payload)
+        elif kind == "clean_failed":
+            self._fail_clean(payload)
+        self._flush_log()
+
+    def _show_progress(self, snapshot):
+        if snapshot.total:
+            self.progress.config(maximum=snapshot.total, value=snapshot.done)
+
+        if snapshot.phase == "scan":
+            text = (
+                f"正在扫描 {snapshot.category or ''}... "
+                f"已扫描 {snapshot.files} 个文件，{self.format_size(snapshot.bytes)}"
+            )
+        elif snapshot.phase == "clean":
+            text = f"正在清理 {snapshot.done}/{snapshot.total}... 已释放 {self.format_size(snapshot.bytes)}"
+        else:
+            return
+
+        text += f"，{self.format_size(snapshot.bytes_per_second)}/s"
+        if snapshot.eta is not None:
+            text += f"，预计剩余 {snapshot.eta:.0f} 秒"
+        self.status_label.config(text=text)
+
+    def stop(self):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+        self.stop_button.config(state=tk.DISABLED)
+        self.status_label.config(text="正在停止...")
+        self.log("正在停止...")
+
+    def _set_busy(self, busy):
+        self.stop_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.scan_button.config(state=state)
+        self.clean_button.config(state=state)
+        self.select_all_button.config(state=state)
+        self.deselect_all_button.config(state=state)
+        self.expand_all_button.config(state=state)
+        self.collapse_all_button.config(state=state)
+
+    def _finish_scan(self):
+        self._set_busy(False)
+        if self.cancel_token.partial:
+            self.status_label.config(text=f"扫描已停止！发现 {len(self.scan_results)} 个可清理项（结果不完整）")
+            self.log(f"扫描已停止！发现 {len(self.scan_results)} 个可清理项")
+            self.log(f"以下类别结果不完整: {', '.join(sorted(self.cancel_token.incomplete))}")
+        else:
+            self.status_label.config(text=f"扫描完成！发现 {len(self.scan_results)} 个可清理项")
+            self.progress.config(value=self.progress.cget("maximum"))
+            self.log(f"扫描完成！发现 {len(self.scan_results)} 个可清理项")
+        self.log(f"总共可释放空间: {self.format_size(self.total_size)}")
+
+    def _fail_scan(self, error):
+        messagebox.showerror("错误", f"扫描失败: {str(error)}")
+        self.progress.config(value=0)
+        self.stop_button.config(state=tk.DISABLED)
+        self.scan_button.config(state=tk.NORMAL)
+
+    def display_results(self, indices):
+        categories = {}
+
+        for index in indices:
+            category = self.scan_results.category(index)
             if category not in categories:
                 categories[category] = []
-            categories[category].append({
-                "id": item_id,
-                "path": data["path"],
-                "size": size
-            })
+            categories[category].append(index)
 
         for category, items in categories.items():
-            category_size = sum(item["size"] for item in items)
-            category_node = self.tree.insert("", tk.END, text=category, values=(
-                f"{len(items)} 项",
-                self.format_size(category_size),
-                "是"
-            ), open=True)
-            self.category_nodes[category] = category_node
-
-            for item in items:
-                item_node = self.tree.insert(category_node, tk.END, text="", values=(
-                    item["path"],
-                    self.format_size(item["size"]),
+            category_node = self.category_nodes.get(category)
+            if category_node is None:
+                category_node = self.tree.insert("", tk.END, text=category, values=(
+                    "0 项",
+                    self.format_size(0),
                     "是"
-                ))
-                self.item_nodes[item["id"]] = item_node
-
-        self.log(f"总共可释放空间: {self.format_size(total_size)}")
+                ), open=False)
+                self.category_nodes[category] = category_node
+                self.node_categories[category_node] = category
+                self.category_totals[category] = [0, 0]
+                self.category_loaded[category] = 0
+                self.placeholder_nodes[category] = self.tree.insert(category_node, tk.END, text="")
+
+            self.selection.extend(items, category)
+            self._refresh_more_node(category)
+
+            batch_size = sum(self.scan_results.size(index) for index in items)
+            totals = self.category_totals[category]
+            totals[0] += len(items)
+            totals[1] += batch_size
+            self.total_size += batch_size
+
+            self.tree.set(category_node, "path", f"{totals[0]} 项")
+            self.tree.set(category_node, "size", self.format_size(totals[1]))
+            self._refresh_category_selection(category)
 
     def start_clean(self):
-        selected_items = []
-        for item_id, item_node in self.item_nodes.items():
-            if self.tree.set(item_node, "selected") == "是":
-                path = self.tree.set(item_node, "path")
-                selected_items.append(path)
+        selected_items = self.scan_results.select(self.selection.selected_indices())
 
         if not selected_items:
             messagebox.showwarning("警告", "请选择要清理的项目")
@@ -324,62 +516,55 @@ class DiskCleanerApp:
         )
 
         if confirm:
-            self.clean_button.config(state=tk.DISABLED)
-            self.scan_button.config(state=tk.DISABLED)
-            self.select_all_button.config(state=tk.DISABLED)
-            self.deselect_all_button.config(state=tk.DISABLED)
-            self.expand_all_button.config(state=tk.DISABLED)
-            self.collapse_all_button.config(state=tk.DISABLED)
-            self.progress.start()
+            self._set_busy(True)
             self.status_label.config(text="正在清理...")
             self.log(f"开始清理 {len(selected_items)} 个项目...")
-
-            thread = threading.Thread(target=self.clean, args=(selected_items,))
+            self.progress_channel = ProgressChannel()
+            self.cancel_token = CancelToken()
+            self.progress.config(value=0, maximum=len(selected_items))
+
+            has_jianying_cache = self.selection.any_selected(JIANYING_CATEGORIES)
+            thread = threading.Thread(
+                target=self.clean,
+                args=(self.progress_channel, self.cancel_token, selected_items, has_jianying_cache)
+            )
             thread.start()
+            self.root.after(PROGRESS_POLL_MS, self._poll_progress, self.progress_channel)
 
-    def clean(self, selected_items):
+    def clean(self, channel, cancel, selected_items, has_jianying_cache=False):
         try:
-            jianying_categories = [
-                "剪映如下缓存内容", "剪映音频缓存", "剪映工作平台缓存",
-                "剪映艺术特效缓存", "剪映临时文件", "剪映预览缓存", "剪映导出缓存"
-            ]
-
-            has_jianying_cache = False
-            for item in selected_items:
-                for item_id, item_node in self.item_nodes.items():
-                    if self.tree.set(item_node, "path") == item:
-                        category = self.tree.set(item_node, "category")
-                        if category in jianying_categories:
-                            has_jianying_cache = True
-                            break
-                if has_jianying_cache:
-                    break
-
-            success_count, total_size = self.cleaner.clean_items(selected_items)
+            success_count, total_size = self.cleaner.clean_items(selected_items, progress=channel, cancel=cancel)
+            channel.post("clean_done", (success_count, total_size, has_jianying_cache))
+        except Exception as e:
+            channel.post("clean_failed", e)
 
-            self.root.after(0, lambda: self.status_label.config(text=f"清理完成！释放 {self.format_size(total_size)}"))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.scan_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.log(f"清理完成！成功清理 {success_count} 个项目，释放 {self.format_size(total_size)}"))
+    def _finish_clean(self, success_count, total_size, has_jianying_cache):
+        self.status_label.config(text=f"清理完成！释放 {self.format_size(total_size)}")
+        self.stop_button.config(state=tk.DISABLED)
+        self.scan_button.config(state=tk.NORMAL)
+        self.log(f"清理完成！成功清理 {success_count} 个项目，释放 {self.format_size(total_size)}")
 
-            message = f"清理完成！\n成功清理 {success_count} 个项目\n释放空间: {self.format_size(total_size)}"
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self._reset_tree_state()
 
-            if has_jianying_cache:
-                message += "\n\n注意：清理剪映缓存后，贴纸、特效等素材可能需要重新下载。"
+        message = f"清理完成！\n成功清理 {success_count} 个项目\n释放空间: {self.format_size(total_size)}"
 
-            self.root.after(0, lambda: messagebox.showinfo("完成", message))
+        if self.cancel_token.partial:
+            message = f"清理已停止。\n成功清理 {success_count} 个项目\n释放空间: {self.format_size(total_size)}"
+            self.log("清理已停止，未处理的项目保持原样")
 
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+        if has_jianying_cache:
+            message += "\n\n注意：清理剪映缓存后，贴纸、特效等素材可能需要重新下载。"
 
-            self.category_nodes = {}
-            self.item_nodes = {}
+        messagebox.showinfo("完成", message)
 
-        except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("错误", f"清理失败: {str(e)}"))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.scan_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.clean_button.config(state=tk.NORMAL))
+    def _fail_clean(self, error):
+        messagebox.showerror("错误", f"清理失败: {str(error)}")
+        self.progress.config(value=0)
+        self.stop_button.config(state=tk.DISABLED)
+        self.scan_button.config(state=tk.NORMAL)
+        self.clean_button.config(state=tk.NORMAL)
 
     @staticmethod
     def format_size(size):
@@ -0,0 +1,76 @@
+from collections import deque
+
+
+def normalize_name(name):
+    return name.lower().replace(" ", "").replace("-", "").replace("_", "")
+
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._terminal = [False]
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._terminal.append(False)
+                state = next_state
+            self._terminal[state] = True
+
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._terminal[self._fail[next_state]]:
+                    self._terminal[next_state] = True
+
+    def search(self, text):
+        goto = self._goto
+        fail = self._fail
+        terminal = self._terminal
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+class NameMatcher:
+    def __init__(self, installed_names, normalized=None):
+        if normalized is None:
+            cleaned = {normalize_name(name) for name in installed_names}
+        else:
+            cleaned = set(normalized)
+        self.has_installed = bool(cleaned)
+        self._has_empty = "" in cleaned
+        cleaned.discard("")
+        self._haystack = "\x00".join(sorted(cleaned))
+        self._automaton = AhoCorasick(cleaned)
+
+    def matches(self, dir_name):
+        if not self.has_installed:
+            return False
+
+        dir_name_clean = normalize_name(dir_name)
+        if not dir_name_clean or self._has_empty:
+            return True
+
+        if dir_name_clean in self._haystack:
+            return True
+
+        return self._automaton.search(dir_name_clean)
@@ -0,0 +1,69 @@
+import os
+from collections import namedtuple
+
+
+PlannedRoot = namedtuple("PlannedRoot", ["key", "path", "excludes"])
+
+
+def canonical_path(path):
+    return os.path.realpath(os.path.abspath(path))
+
+
+def path_key(path):
+    return os.path.normcase(path)
+
+
+def _is_within(child_key, parent_key):
+    if child_key == parent_key:
+        return False
+    return child_key.startswith(os.path.join(parent_key, ""))
+
+
+class RootPlanner:
+    def __init__(self):
+        self._roots = []
+
+    def add(self, key, path, whole=False):
+        self._roots.append((key, path, whole))
+
+    def plan(self):
+        planned = []
+        seen = set()
+
+        for key, path, whole in self._roots:
+            if not path:
+                continue
+            try:
+                canonical = canonical_path(path)
+            except (OSError, ValueError):
+                continue
+            canonical_key = path_key(canonical)
+            if canonical_key in seen:
+                continue
+            seen.add(canonical_key)
+            planned.append((key, canonical, canonical_key, whole))
+
+        by_depth = sorted(planned, key=lambda item: item[2])
+        parents = {}
+        for index, (key, canonical, canonical_key, whole) in enumerate(by_depth):
+            for ancestor in reversed(by_depth[:index]):
+                if _is_within(canonical_key, ancestor[2]):
+                    parents[canonical_key] = ancestor
+                    break
+
+        absorbed = set()
+        for key, canonical, canonical_key, whole in by_depth:
+            parent = parents.get(canonical_key)
+            if parent is not None and (parent[3] or parent[2] in absorbed):
+                absorbed.add(canonical_key)
+
+        excludes = {}
+        for canonical_key, parent in parents.items():
+            if canonical_key not in absorbed:
+                excludes.setdefault(parent[2], set()).add(canonical_key)
+
+        return {
+            key: PlannedRoot(key, canonical, frozenset(excludes.get(canonical_key, ())))
+            for key, canonical, canonical_key, whole in planned
+            if canonical_key not in absorbed
+        }
@@ -0,0 +1,92 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+
+
+ProgressSnapshot = namedtuple("ProgressSnapshot", [
+    "phase", "done", "total", "files", "bytes", "category",
+    "elapsed", "files_per_second", "bytes_per_second", "eta",
+])
+
+
+class ProgressChannel:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._events = queue.Queue()
+        self._reset(None, 0)
+
+    def _reset(self, phase, total):
+        self._phase = phase
+        self._total = total
+        self._done = 0
+        self._files = 0
+        self._bytes = 0
+        self._category = None
+        self._started = self._clock()
+
+    def start(self, phase, total=0):
+        with self._lock:
+            self._reset(phase, total)
+
+    def set_total(self, total):
+        with self._lock:
+            self._total = total
+
+    def advance(self, files=0, size=0, category=None, done=0):
+        with self._lock:
+            self._files += files
+            self._bytes += size
+            self._done += done
+            if category is not None:
+                self._category = category
+
+    def log(self, message):
+        self._events.put(("log", message))
+
+    def post(self, kind, payload=None):
+        self._events.put((kind, payload))
+
+    def drain(self):
+        events = []
+        try:
+            while True:
+                events.append(self._events.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def snapshot(self):
+        with self._lock:
+            phase, done, total = self._phase, self._done, self._total
+            files, size, category = self._files, self._bytes, self._category
+            elapsed = self._clock() - self._started
+
+        files_per_second = files / elapsed if elapsed > 0 else 0.0
+        bytes_per_second = size / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total and 0 < done < total:
+            eta = elapsed * (total - done) / done
+        elif total and done >= total:
+            eta = 0.0
+
+        return ProgressSnapshot(
+            phase, done, total, files, size, category,
+            elapsed, files_per_second, bytes_per_second, eta,
+        )
+
+
+class ProgressObserver:
+    def __init__(self, channel, recorder=None):
+        self.channel = channel
+        self.recorder = recorder
+
+    def directory(self, path, seconds, files, dirs, size):
+        if self.recorder is not None:
+            self.recorder.directory(path, seconds, files, dirs, size)
+        self.channel.advance(files, size)
+
+    def error(self, path, exc):
+        if self.recorder is not None:
+            self.recorder.error(path, exc)
@@ -0,0 +1,181 @@
+import heapq
+import os
+from array import array
+from collections import namedtuple
+
+
+ScanRecord = namedtuple("ScanRecord", ["index", "category", "path", "size"])
+
+
+class ScanResultSet:
+    def __init__(self, records=None):
+        self.categories = []
+        self._category_ids = {}
+        self._category_index = array('H')
+        self.sizes = array('q')
+        self._parents = []
+        self._parent_ids = {}
+        self._parent_index = array('l')
+        self._names = []
+        self.partial = False
+        self.incomplete = []
+
+        if records is not None:
+            self.extend(records)
+
+    def add(self, category, path, size):
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            category_id = len(self.categories)
+            self._category_ids[category] = category_id
+            self.categories.append(category)
+
+        parent, name = os.path.split(path)
+        parent_id = self._parent_ids.get(parent)
+        if parent_id is None:
+            parent_id = len(self._parents)
+            self._parent_ids[parent] = parent_id
+            self._parents.append(parent)
+
+        self._category_index.append(category_id)
+        self.sizes.append(size)
+        self._parent_index.append(parent_id)
+        self._names.append(name)
+        return len(self.sizes) - 1
+
+    def extend(self, records):
+        for category, path, size in records:
+            self.add(category, path, size)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __iter__(self):
+        for index in range(len(self.sizes)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        return ScanRecord(index, self.category(index), self.path(index), self.sizes[index])
+
+    def category(self, index):
+        return self.categories[self._category_index[index]]
+
+    def path(self, index):
+        name = self._names[index]
+        parent = self._parents[self._parent_index[index]]
+        return os.path.join(parent, name) if name else parent
+
+    def size(self, index):
+        return self.sizes[index]
+
+    def total_size(self):
+        return sum(self.sizes)
+
+    def category_indices(self, category):
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            return []
+        return [index for index, value in enumerate(self._category_index) if value == category_id]
+
+    def view(self, category):
+        return ScanResultView(self, self.category_indices(category))
+
+    def select(self, indices):
+        return ScanResultView(self, indices)
+
+    def category_totals(self):
+        totals = {}
+        for category_id, size in zip(self._category_index, self.sizes):
+            count, total_size = totals.get(category_id, (0, 0))
+            totals[category_id] = (count + 1, total_size + size)
+        return {self.categories[category_id]: value for category_id, value in sorted(totals.items())}
+
+
+class TopResultSet(ScanResultSet):
+    def __init__(self, top_n=None, min_size=None):
+        super().__init__()
+        self.top_n = top_n
+        self.min_size = min_size
+        self._keep_all = top_n is None and min_size is None
+        self._totals = {}
+        self._root_totals = {}
+        self._large = {}
+        self._heaps = {}
+
+    def offer(self, category, path, size, root=None):
+        totals = self._totals.get(category)
+        if totals is None:
+            totals = self._totals[category] = [0, 0]
+            self._large[category] = []
+            self._heaps[category] = []
+        totals[0] += 1
+        totals[1] += size
+
+        root_totals = self._root_totals.get((category, root))
+        if root_totals is None:
+            root_totals = self._root_totals[(category, root)] = [0, 0]
+        root_totals[0] += 1
+        root_totals[1] += size
+
+        if self._keep_all or self.min_size is not None and size >= self.min_size:
+            self._large[category].append((size, path))
+            return
+        if not self.top_n:
+            return
+        heap = self._heaps[category]
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, (size, path))
+        elif (size, path) > heap[0]:
+            heapq.heapreplace(heap, (size, path))
+
+    def offer_all(self, records, root=None):
+        for category, path, size in records:
+            self.offer(category, path, size, root)
+
+    def finish(self):
+        for category in self._totals:
+            kept = self._large.pop(category) + self._heaps.pop(category)
+            kept.sort(key=lambda entry: (-entry[0], entry[1]))
+            for size, path in kept:
+                self.add(category, path, size)
+        self._large = {}
+        self._heaps = {}
+        return self
+
+    def total_size(self):
+        return sum(size for count, size in self._totals.values())
+
+    def retained_size(self):
+        return sum(self.sizes)
+
+    def category_totals(self):
+        return {category: tuple(value) for category, value in self._totals.items()}
+
+    def root_totals(self):
+        return {key: tuple(value) for key, value in self._root_totals.items()}
+
+    def omitted(self):
+        count = sum(count for count, size in self._totals.values()) - len(self)
+        return count, self.total_size() - self.retained_size()
+
+
+class ScanResultView:
+    def __init__(self, results, indices):
+        self.results = results
+        self.indices = list(indices)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        for index in self.indices:
+            yield self.results[index]
+
+    def paths(self):
+        return [self.results.path(index) for index in self.indices]
+
+    def categories(self):
+        return {self.results.category(index) for index in self.indices}
+
+    def total_size(self):
+        return sum(self.results.sizes[index] for index in self.indices)
@@ -0,0 +1,193 @@
+import fnmatch
+import json
+import os
+import re
+from collections import namedtuple
+
+from planner import path_key
+from walker import list_dir
+
+
+RULE_MODES = ("files", "total")
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", "default.json")
+
+_FIELD = re.compile(r"\{(\w+)\}")
+
+CategoryRule = namedtuple("CategoryRule", ["prefix", "label", "roots", "mode", "include", "exclude"])
+ResolvedRoot = namedtuple("ResolvedRoot", ["rule", "path"])
+
+
+def _is_glob(segment):
+    return any(char in segment for char in "*?[")
+
+
+def _compile_globs(patterns):
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(path_key(pattern)) for pattern in patterns))
+
+
+class NameFilter:
+    def __init__(self, include=(), exclude=(), paths=frozenset()):
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.paths = paths
+        self._include = _compile_globs(self.include)
+        self._exclude = _compile_globs(self.exclude)
+
+    def accepts(self, entry):
+        name = path_key(os.path.basename(entry.path))
+        if self._exclude is not None and self._exclude.match(name):
+            return False
+        return entry.is_dir or self._include is None or bool(self._include.match(name))
+
+    def with_paths(self, paths):
+        if not paths:
+            return self
+        return NameFilter(self.include, self.exclude, frozenset(self.paths) | frozenset(paths))
+
+    def __contains__(self, key):
+        if key in self.paths:
+            return True
+        return self._exclude is not None and bool(self._exclude.match(os.path.basename(key)))
+
+    def __bool__(self):
+        return bool(self.paths) or self._exclude is not None
+
+
+class _SegmentNode:
+    __slots__ = ("literals", "globs", "targets")
+
+    def __init__(self):
+        self.literals = {}
+        self.globs = []
+        self.targets = []
+
+    def child(self, segment):
+        if not _is_glob(segment):
+            key = path_key(segment)
+            node = self.literals.get(key)
+            if node is None:
+                node = self.literals[key] = (segment, _SegmentNode())
+            return node[1]
+        pattern = path_key(segment)
+        for glob, regex, node in self.globs:
+            if glob == pattern:
+                return node
+        node = _SegmentNode()
+        self.globs.append((pattern, re.compile(fnmatch.translate(pattern)), node))
+        return node
+
+    def needs_listing(self):
+        if self.globs or len(self.literals) != 1:
+            return True
+        segment, node = next(iter(self.literals.values()))
+        return bool(node.targets)
+
+
+def expand_template(template, folder):
+    def replace(match):
+        value = folder(match.group(1))
+        if not value:
+            raise KeyError(match.group(1))
+        return value
+    return os.path.normpath(_FIELD.sub(replace, template.replace("/", os.sep)))
+
+
+class RuleSet:
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def extend(self, other):
+        self.rules.extend(other)
+        return self
+
+    def prefixes(self):
+        return list(dict.fromkeys(rule.prefix for rule in self.rules))
+
+    def filter(self, *prefixes):
+        return RuleSet(rule for rule in self.rules if rule.prefix in prefixes)
+
+    def resolve(self, folder, lister=list_dir):
+        anchors = {}
+        for rule_index, rule in enumerate(self.rules):
+            for root_index, template in enumerate(rule.roots):
+                try:
+                    path = expand_template(template, folder)
+                except (KeyError, OSError, ValueError):
+                    continue
+                drive, rest = os.path.splitdrive(path)
+                anchor = drive + os.sep if rest.startswith(os.sep) or drive else ""
+                node = anchors.get(path_key(anchor))
+                if node is None:
+                    node = anchors[path_key(anchor)] = (anchor, _SegmentNode())
+                node = node[1]
+                for segment in rest.split(os.sep):
+                    if segment:
+                        node = node.child(segment)
+                node.targets.append((rule_index, root_index))
+
+        found = []
+        stack = list(anchors.values())
+        while stack:
+            path, node = stack.pop()
+            for rule_index, root_index in node.targets:
+                found.append((rule_index, root_index, path))
+            if not node.literals and not node.globs:
+                continue
+            if not node.needs_listing():
+                segment, child = next(iter(node.literals.values()))
+                stack.append((os.path.join(path, segment), child))
+                continue
+            for entry in lister(path):
+                if not entry.is_dir:
+                    continue
+                name = path_key(os.path.basename(entry.path))
+                literal = node.literals.get(name)
+                if literal is not None:
+                    stack.append((entry.path, literal[1]))
+                for glob, regex, child in node.globs:
+                    if regex.match(name):
+                        stack.append((entry.path, child))
+
+        found.sort(key=lambda item: (item[0], item[1], path_key(item[2])))
+        return [ResolvedRoot(self.rules[rule_index], path) for rule_index, root_index, path in found]
+
+
+def parse_rule(data, source="<rules>"):
+    try:
+        prefix = data["prefix"]
+        label = data["label"]
+        roots = data["roots"]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"无效的规则文件 {source}: 缺少字段 {e}")
+    mode = data.get("mode", "files")
+    if mode not in RULE_MODES:
+        raise ValueError(f"无效的规则文件 {source}: 未知的模式 {mode}")
+    if mode == "total" and (data.get("include") or data.get("exclude")):
+        raise ValueError(f"无效的规则文件 {source}: total 模式整体删除根目录，不能使用 include/exclude")
+    if isinstance(roots, str):
+        roots = [roots]
+    return CategoryRule(
+        prefix, label, tuple(roots), mode,
+        tuple(data.get("include", ())), tuple(data.get("exclude", ())),
+    )
+
+
+def load_rules(*paths):
+    rules = RuleSet()
+    for path in paths or (DEFAULT_RULES,):
+        with open(path, encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"无效的规则文件 {path}: {e}")
+        entries = data.get("categories", []) if isinstance(data, dict) else data
+        rules.extend(parse_rule(entry, path) for entry in entries)
+    return rules
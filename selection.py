@@ -0,0 +1,74 @@
+from array import array
+
+
+class SelectionModel:
+    def __init__(self):
+        self.bits = bytearray()
+        self.members = {}
+        self.selected_counts = {}
+
+    def add(self, index, category, selected=True):
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index + 1 - len(self.bits)))
+        members = self.members.get(category)
+        if members is None:
+            members = self.members[category] = array('l')
+            self.selected_counts[category] = 0
+        members.append(index)
+        if selected:
+            self.bits[index] = 1
+            self.selected_counts[category] += 1
+
+    def extend(self, indices, category, selected=True):
+        for index in indices:
+            self.add(index, category, selected)
+
+    def __len__(self):
+        return len(self.bits)
+
+    def is_selected(self, index):
+        return bool(self.bits[index])
+
+    def set(self, index, category, selected):
+        value = 1 if selected else 0
+        if self.bits[index] != value:
+            self.bits[index] = value
+            self.selected_counts[category] += 1 if selected else -1
+
+    def toggle(self, index, category):
+        self.set(index, category, not self.bits[index])
+
+    def set_category(self, category, selected):
+        value = 1 if selected else 0
+        bits = self.bits
+        for index in self.members.get(category, ()):
+            bits[index] = value
+        self.selected_counts[category] = len(self.members.get(category, ())) if selected else 0
+
+    def set_all(self, selected):
+        self.bits[:] = (b"\x01" if selected else b"\x00") * len(self.bits)
+        for category, members in self.members.items():
+            self.selected_counts[category] = len(members) if selected else 0
+
+    def category_state(self, category):
+        selected = self.selected_counts.get(category, 0)
+        if selected == 0:
+            return "否"
+        if selected == len(self.members[category]):
+            return "是"
+        return "部分"
+
+    def any_selected(self, categories):
+        return any(self.selected_counts.get(category, 0) for category in categories)
+
+    def selected_count(self):
+        return sum(self.selected_counts.values())
+
+    def selected_indices(self):
+        bits = self.bits
+        indices = []
+        index = bits.find(1)
+        while index >= 0:
+            indices.append(index)
+            index = bits.find(1, index + 1)
+        return indices
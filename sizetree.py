@@ -0,0 +1,81 @@
+from collections import namedtuple
+
+
+RollupEntry = namedtuple("RollupEntry", ["path", "size", "files", "is_dir"])
+
+
+class SizeNode:
+    __slots__ = ("path", "depth", "children", "files", "bytes", "total_files", "total_bytes", "entries")
+
+    def __init__(self, path, depth, keep_files=False):
+        self.path = path
+        self.depth = depth
+        self.children = []
+        self.files = 0
+        self.bytes = 0
+        self.total_files = 0
+        self.total_bytes = 0
+        self.entries = [] if keep_files else None
+
+
+class SizeTree:
+    def __init__(self, root, keep_files=0):
+        self.keep_files = keep_files
+        self.root = SizeNode(root, 0, keep_files > 0)
+        self._nodes = [self.root]
+
+    def add_dir(self, parent, path):
+        depth = parent.depth + 1
+        node = SizeNode(path, depth, depth < self.keep_files)
+        parent.children.append(node)
+        self._nodes.append(node)
+        return node
+
+    def add_file(self, node, path, size):
+        node.files += 1
+        node.bytes += size
+        if node.entries is not None:
+            node.entries.append((path, size))
+
+    def rollup(self):
+        for node in reversed(self._nodes):
+            node.total_files = node.files
+            node.total_bytes = node.bytes
+            for child in node.children:
+                node.total_files += child.total_files
+                node.total_bytes += child.total_bytes
+        return self
+
+    @property
+    def total_bytes(self):
+        return self.root.total_bytes
+
+    @property
+    def total_files(self):
+        return self.root.total_files
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def nodes_at(self, depth):
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.depth == depth:
+                yield node
+            elif node.depth < depth:
+                stack.extend(reversed(node.children))
+
+    def report(self, depth=0):
+        if depth > self.keep_files:
+            raise ValueError(f"files above depth {depth} were not kept (keep_files={self.keep_files})")
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.depth == depth:
+                yield RollupEntry(node.path, node.total_bytes, node.total_files, True)
+                continue
+            for path, size in node.entries:
+                yield RollupEntry(path, size, 1, False)
+            stack.extend(reversed(node.children))
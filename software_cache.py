@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import threading
+from collections import namedtuple
+
+from backend import UNINSTALL_KEYS
+from matcher import normalize_name
+
+
+CACHE_VERSION = 1
+
+InstalledSoftware = namedtuple("InstalledSoftware", ["names", "normalized"])
+
+
+def default_cache_path():
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "DiskCleaner", "installed_software.json")
+
+
+def build_index(names):
+    names = frozenset(names)
+    return InstalledSoftware(names, frozenset(normalize_name(name) for name in names))
+
+
+def key_signature(backend, hive, path):
+    try:
+        subkeys, last_write = backend.key_info(hive, path)
+    except OSError:
+        return None
+    return [subkeys, last_write]
+
+
+class SoftwareCache:
+    def __init__(self, path=None):
+        self.path = path or default_cache_path()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self, backend):
+        with self._lock:
+            cached = self._read()
+            keys = {}
+            changed = False
+            for hive, path in UNINSTALL_KEYS:
+                key = f"{hive}\\{path}"
+                try:
+                    signature = key_signature(backend, hive, path)
+                except NotImplementedError:
+                    return build_index(backend.installed_software())
+                entry = cached.get(key)
+                if entry is not None and entry["signature"] == signature:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    changed = True
+                    names = sorted(backend.uninstall_names(hive, path))
+                    entry = {
+                        "signature": signature,
+                        "names": names,
+                        "normalized": [normalize_name(name) for name in names],
+                    }
+                keys[key] = entry
+            if changed or len(cached) != len(keys):
+                self._write(keys)
+
+        names = set()
+        normalized = set()
+        for entry in keys.values():
+            names.update(entry["names"])
+            normalized.update(entry["normalized"])
+        return InstalledSoftware(frozenset(names), frozenset(normalized))
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        keys = data.get("keys")
+        if not isinstance(keys, dict):
+            return {}
+        return {
+            key: entry for key, entry in keys.items()
+            if isinstance(entry, dict)
+            and "signature" in entry
+            and isinstance(entry.get("names"), list)
+            and isinstance(entry.get("normalized"), list)
+        }
+
+    def _write(self, keys):
+        data = {"version": CACHE_VERSION, "keys": keys}
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,136 @@
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+SLOWEST_DIRS = 10
+
+
+class RootStats:
+    def __init__(self, category, root, label=None):
+        self.category = category
+        self.root = root
+        self.label = label
+        self.seconds = 0.0
+        self.dirs = 0
+        self.files = 0
+        self.bytes = 0
+        self.items = 0
+        self.errors = Counter()
+        self._slowest = []
+
+    def directory(self, path, seconds, files, dirs, size):
+        self.dirs += 1
+        self.files += files
+        self.bytes += size
+        if len(self._slowest) < SLOWEST_DIRS:
+            heapq.heappush(self._slowest, (seconds, path))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, path))
+
+    def error(self, path, exc):
+        self.errors[type(exc).__name__] += 1
+
+    def slowest_dirs(self):
+        return sorted(self._slowest, reverse=True)
+
+    def to_dict(self):
+        return {
+            "category": self.category,
+            "root": self.root,
+            "label": self.label,
+            "seconds": round(self.seconds, 6),
+            "dirs": self.dirs,
+            "files": self.files,
+            "bytes": self.bytes,
+            "items": self.items,
+            "errors": dict(self.errors),
+            "slowest_dirs": [{"path": path, "seconds": round(seconds, 6)} for seconds, path in self.slowest_dirs()],
+        }
+
+
+class ScanStats:
+    def __init__(self, phase_hook=None, clock=time.perf_counter):
+        self.phase_hook = phase_hook
+        self._clock = clock
+        self._origin = clock()
+        self._lock = threading.Lock()
+        self.roots = []
+        self.phases = []
+        self.events = []
+
+    def root(self, category, root, label=None):
+        stats = RootStats(category, root, label)
+        with self._lock:
+            self.roots.append(stats)
+        return stats
+
+    @contextmanager
+    def phase(self, name, category="phase", **args):
+        hook = self.phase_hook(name, args) if self.phase_hook is not None else None
+        start = self._clock()
+        try:
+            if hook is None:
+                yield
+            else:
+                with hook:
+                    yield
+        finally:
+            end = self._clock()
+            self.add_event(name, category, start, end, args)
+            if category == "phase":
+                with self._lock:
+                    self.phases.append({"name": name, "seconds": round(end - start, 6), "args": args})
+
+    def add_event(self, name, category, start, end, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args or {},
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def categories(self):
+        totals = {}
+        for stats in self.roots:
+            total = totals.setdefault(stats.category, {
+                "seconds": 0.0, "dirs": 0, "files": 0, "bytes": 0, "items": 0, "errors": Counter(),
+            })
+            total["seconds"] += stats.seconds
+            total["dirs"] += stats.dirs
+            total["files"] += stats.files
+            total["bytes"] += stats.bytes
+            total["items"] += stats.items
+            total["errors"].update(stats.errors)
+        for total in totals.values():
+            total["seconds"] = round(total["seconds"], 6)
+            total["errors"] = dict(total["errors"])
+        return totals
+
+    def slowest_dirs(self, limit=SLOWEST_DIRS):
+        merged = heapq.nlargest(limit, (entry for stats in self.roots for entry in stats.slowest_dirs()))
+        return [{"path": path, "seconds": round(seconds, 6)} for seconds, path in merged]
+
+    def to_dict(self):
+        return {
+            "phases": list(self.phases),
+            "categories": self.categories(),
+            "roots": [stats.to_dict() for stats in self.roots],
+            "slowest_dirs": self.slowest_dirs(),
+        }
+
+    def export_chrome_trace(self, path):
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
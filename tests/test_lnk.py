@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lnk
+
+
+# Assembled field by field from the MS-SHLLINK and shell-item layouts, independently of
+# benchmarks/bench_lnk.py. Replace with shortcuts captured on Windows when available.
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "lnk")
+
+
+def read_fixture(name):
+    return lnk.read_link(os.path.join(FIXTURES, name))
+
+
+class ParseLinkFixtureTest(unittest.TestCase):
+    def test_link_info_only(self):
+        link = read_fixture("linkinfo_only.lnk")
+        self.assertIsNone(link.id_list_path)
+        self.assertEqual(link.target, "C:\\Windows\\System32\\notepad.exe")
+
+    def test_link_info_unicode_offsets(self):
+        link = read_fixture("linkinfo_unicode.lnk")
+        self.assertEqual(link.local_path, "C:\\Users\\Public\\文档\\报告.txt")
+        self.assertEqual(link.id_list_path, link.local_path)
+        self.assertEqual(link.target, link.local_path)
+
+    def test_id_list_only_uses_long_names(self):
+        link = read_fixture("idlist_only.lnk")
+        self.assertIsNone(link.local_path)
+        self.assertEqual(link.target, "C:\\Program Files\\Mozilla Firefox\\firefox.exe")
+
+    def test_id_list_older_extension_versions(self):
+        self.assertEqual(read_fixture("idlist_xp.lnk").target, "D:\\Games Library\\Solitaire Deluxe.exe")
+        self.assertEqual(
+            read_fixture("idlist_win7.lnk").target,
+            "C:\\Tools and Utilities\\Sysinternals Suite\\procexp64.exe",
+        )
+
+    def test_environment_block(self):
+        link = read_fixture("env_block.lnk")
+        self.assertIsNone(link.local_path)
+        self.assertEqual(link.env_path, "%windir%\\system32\\mmc.exe")
+        self.assertEqual(link.target, os.path.expandvars(link.env_path))
+
+    def test_network_link_has_no_checkable_target(self):
+        link = read_fixture("network.lnk")
+        self.assertEqual(link.network_path, "\\\\FILESERVER\\Share\\Reports\\2024\\q3.xlsx")
+        self.assertIsNone(link.target)
+
+    def test_advertised_link_has_no_checkable_target(self):
+        link = read_fixture("advertised.lnk")
+        self.assertTrue(link.is_advertised)
+        self.assertIsNone(link.target)
+
+    def test_find_invalid_shortcuts_skips_unresolvable(self):
+        paths = [os.path.join(FIXTURES, name) for name in sorted(os.listdir(FIXTURES))]
+        invalid = lnk.find_invalid_shortcuts(paths, exists=lambda target: "notepad" in target)
+        self.assertEqual(sorted(os.path.basename(path) for path in invalid), [
+            "env_block.lnk", "idlist_only.lnk", "idlist_win7.lnk", "idlist_xp.lnk", "linkinfo_unicode.lnk",
+        ])
+
+    def test_truncated_link_is_rejected(self):
+        with open(os.path.join(FIXTURES, "idlist_only.lnk"), "rb") as f:
+            data = f.read()
+        with self.assertRaises(lnk.LinkFormatError):
+            lnk.parse_link(data[:100])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from planner import RootPlanner, canonical_path, path_key
+
+
+class RootPlannerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="planner_")
+        self.outer = os.path.join(self.directory, "outer")
+        self.inner = os.path.join(self.outer, "inner")
+        self.deepest = os.path.join(self.inner, "deepest")
+        os.makedirs(self.deepest)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def key(self, path):
+        return path_key(canonical_path(path))
+
+    def test_nested_root_is_excluded_from_a_file_listing_root(self):
+        planner = RootPlanner()
+        planner.add("outer", self.outer)
+        planner.add("inner", self.inner)
+        plan = planner.plan()
+
+        self.assertEqual(plan["outer"].excludes, frozenset([self.key(self.inner)]))
+        self.assertIn("inner", plan)
+
+    def test_nested_roots_are_not_planned_under_a_whole_root(self):
+        planner = RootPlanner()
+        planner.add("outer", self.outer, whole=True)
+        planner.add("inner", self.inner)
+        planner.add("deepest", self.deepest)
+        plan = planner.plan()
+
+        self.assertEqual(plan["outer"].excludes, frozenset())
+        self.assertNotIn("inner", plan)
+        self.assertNotIn("deepest", plan)
+
+    def test_roots_below_a_nested_whole_root_stay_with_it(self):
+        planner = RootPlanner()
+        planner.add("outer", self.outer)
+        planner.add("inner", self.inner, whole=True)
+        planner.add("deepest", self.deepest)
+        plan = planner.plan()
+
+        self.assertEqual(plan["outer"].excludes, frozenset([self.key(self.inner)]))
+        self.assertEqual(plan["inner"].excludes, frozenset())
+        self.assertNotIn("deepest", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
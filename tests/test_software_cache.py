@@ -0,0 +1,100 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import UNINSTALL_KEYS, FixtureBackend
+from matcher import NameMatcher
+from software_cache import SoftwareCache
+
+
+class CountingBackend(FixtureBackend):
+    def __init__(self, root, installed=()):
+        self.queries = 0
+        super().__init__(root, installed=installed)
+
+    def query_value(self, hive, path, name):
+        self.queries += 1
+        return super().query_value(hive, path, name)
+
+
+class SoftwareCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="software_cache_")
+        self.path = os.path.join(self.directory, "installed_software.json")
+        self.backend = CountingBackend(self.directory, installed=["Foo App", "Bar-Tool"])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def load(self):
+        self.backend.queries = 0
+        return SoftwareCache(self.path).load(self.backend)
+
+    def test_unchanged_keys_are_not_enumerated_again(self):
+        first = self.load()
+        self.assertEqual(self.backend.queries, 2)
+        self.assertEqual(first.names, {"foo app", "bar-tool"})
+        self.assertEqual(first.normalized, {"fooapp", "bartool"})
+
+        second = self.load()
+        self.assertEqual(self.backend.queries, 0)
+        self.assertEqual(second, first)
+
+    def test_only_the_changed_key_is_enumerated(self):
+        self.load()
+        self.backend.add_installed("New Thing", hive="HKCU")
+        index = self.load()
+        self.assertEqual(self.backend.queries, 1)
+        self.assertIn("new thing", index.names)
+        self.assertIn("newthing", index.normalized)
+
+    def test_removed_subkey_invalidates_its_key(self):
+        self.load()
+        hive, path = UNINSTALL_KEYS[0]
+        self.backend.remove_key(hive, path + "\\Foo App")
+        index = self.load()
+        self.assertEqual(index.names, {"bar-tool"})
+        self.assertEqual(self.backend.queries, 1)
+
+    def test_in_place_display_name_change_is_not_detected(self):
+        # Editing a value under an existing subkey leaves the Uninstall key's
+        # subkey count and last-write time unchanged, so the cache keeps the old name.
+        self.load()
+        hive, path = UNINSTALL_KEYS[0]
+        self.backend.add_key(hive, path + "\\Foo App", {"DisplayName": "Foo App 2"})
+        self.assertIn("foo app 2", self.backend.installed_software())
+        index = self.load()
+        self.assertEqual(self.backend.queries, 0)
+        self.assertIn("foo app", index.names)
+        self.assertNotIn("foo app 2", index.names)
+
+    def test_corrupt_cache_is_rebuilt(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        index = self.load()
+        self.assertEqual(index.names, {"foo app", "bar-tool"})
+        self.assertEqual(self.load().names, index.names)
+        self.assertEqual(self.backend.queries, 0)
+
+    def test_write_leaves_no_temporary_files(self):
+        self.load()
+        self.backend.add_installed("Another")
+        self.load()
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.directory) if name.startswith("installed_software")),
+            ["installed_software.json"],
+        )
+
+    def test_matcher_accepts_stored_normalized_names(self):
+        index = self.load()
+        matcher = NameMatcher(index.names, index.normalized)
+        self.assertTrue(matcher.matches("Bar Tool"))
+        self.assertFalse(matcher.matches("Baz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
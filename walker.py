@@ -0,0 +1,122 @@
+import os
+import time
+from collections import namedtuple
+
+from sizetree import SizeTree
+
+
+CANCEL_CHECK_INTERVAL = 1024
+
+WalkEntry = namedtuple("WalkEntry", ["path", "size", "mtime", "is_dir"])
+
+
+def list_dir(path, on_error=None):
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        if on_error is not None:
+            on_error(path, e)
+        return
+
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    yield WalkEntry(entry.path, 0, st.st_mtime, True)
+                elif entry.is_dir():
+                    continue
+                else:
+                    st = entry.stat()
+                    yield WalkEntry(entry.path, st.st_size, st.st_mtime, False)
+            except OSError as e:
+                if on_error is not None:
+                    on_error(entry.path, e)
+                continue
+
+
+def list_dir_observed(path, observer):
+    start = time.perf_counter()
+    entries = list(list_dir(path, observer.error))
+    seconds = time.perf_counter() - start
+
+    files = dirs = size = 0
+    for entry in entries:
+        if entry.is_dir:
+            dirs += 1
+        else:
+            files += 1
+            size += entry.size
+    observer.directory(path, seconds, files, dirs, size)
+    return entries
+
+
+def _list_entries(path, observer=None):
+    if observer is not None:
+        return list_dir_observed(path, observer)
+    return list_dir(path)
+
+
+def walk(root, excludes=None, observer=None, cancel=None):
+    stack = [root]
+    unchecked = 0
+
+    while stack:
+        if cancel is not None and cancel.cancelled:
+            return
+        current = stack.pop()
+        subdirs = []
+        for entry in _list_entries(current, observer):
+            if cancel is not None:
+                unchecked += 1
+                if unchecked >= CANCEL_CHECK_INTERVAL:
+                    unchecked = 0
+                    if cancel.cancelled:
+                        return
+            if entry.is_dir:
+                if excludes and os.path.normcase(entry.path) in excludes:
+                    continue
+                subdirs.append(entry.path)
+            yield entry
+        stack.extend(reversed(subdirs))
+
+
+def iter_files(root, excludes=None, observer=None, cancel=None):
+    for entry in walk(root, excludes, observer, cancel):
+        if not entry.is_dir:
+            yield entry
+
+
+def dir_size(root, excludes=None, observer=None, cancel=None):
+    total_size = 0
+    for entry in walk(root, excludes, observer, cancel):
+        total_size += entry.size
+    return total_size
+
+
+def size_tree(root, excludes=None, observer=None, cancel=None, keep_files=0):
+    tree = SizeTree(root, keep_files)
+    stack = [tree.root]
+    unchecked = 0
+
+    while stack:
+        if cancel is not None and cancel.cancelled:
+            break
+        node = stack.pop()
+        subdirs = []
+        for entry in _list_entries(node.path, observer):
+            if cancel is not None:
+                unchecked += 1
+                if unchecked >= CANCEL_CHECK_INTERVAL:
+                    unchecked = 0
+                    if cancel.cancelled:
+                        break
+            if entry.is_dir:
+                if excludes and os.path.normcase(entry.path) in excludes:
+                    continue
+                subdirs.append(tree.add_dir(node, entry.path))
+            else:
+                tree.add_file(node, entry.path, entry.size)
+        stack.extend(reversed(subdirs))
+
+    return tree.rollup()